@@ -0,0 +1,99 @@
+import os
+import time
+import threading
+import logging
+from functools import lru_cache
+import chromadb
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_NAME = "resume_knowledge"
+
+# HNSW settings used whenever the collection is created. Embeddings are L2-normalized
+# so cosine space matches their geometry; a large batch_size/sync_threshold buffers
+# bulk adds in memory and defers graph updates and persisting to disk, instead of
+# doing them on every add.
+COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": 100,
+    "hnsw:M": 16,
+    "hnsw:batch_size": 1000,
+    "hnsw:sync_threshold": 10000,
+}
+
+@lru_cache(maxsize=None)
+def get_client(path: str = "./data/chroma_db") -> chromadb.PersistentClient:
+    """
+    Shared ChromaDB client per database path
+
+    Every module in the process reuses the same PersistentClient instead of
+    opening its own handle on the sqlite store.
+    """
+    os.makedirs(path, exist_ok=True)
+    logger.info(f"Opening ChromaDB at {path}")
+    return chromadb.PersistentClient(path=path)
+
+def get_embedding_collection(client: chromadb.PersistentClient, embedding_model: str):
+    """
+    The resume collection, holding vectors from embedding_model
+
+    The model is recorded in the collection metadata. A collection filled by a
+    different model (or one that predates the record) is deleted and recreated,
+    since its vectors can't be mixed with the new ones - the ingest scripts use
+    models with different dimensions.
+    """
+    metadata = {**COLLECTION_METADATA, "embedding_model": embedding_model}
+    try:
+        collection = client.get_collection(COLLECTION_NAME)
+    except Exception:
+        return client.create_collection(COLLECTION_NAME, metadata=metadata)
+
+    existing_model = (collection.metadata or {}).get("embedding_model")
+    if existing_model == embedding_model:
+        return collection
+
+    logger.info(f"Recreating {COLLECTION_NAME}: it holds {existing_model or 'unrecorded'} embeddings, not {embedding_model}")
+    client.delete_collection(COLLECTION_NAME)
+    return client.create_collection(COLLECTION_NAME, metadata=metadata)
+
+# Written next to the database by the ingest scripts, so a running API process
+# can tell that its in-memory copy of the collection is out of date
+INDEX_VERSION_FILE = "index_version"
+
+def mark_collection_updated(path: str = "./data/chroma_db") -> None:
+    """Record that the collection at path was changed by an ingest"""
+    with open(os.path.join(path, INDEX_VERSION_FILE), "w") as f:
+        f.write(str(time.time_ns()))
+
+def collection_version(path: str = "./data/chroma_db") -> str:
+    """Stamp written by the last mark_collection_updated(), or "" if there is none"""
+    try:
+        with open(os.path.join(path, INDEX_VERSION_FILE)) as f:
+            return f.read()
+    except OSError:
+        return ""
+
+class TTLCache:
+    """Minimal time-based cache: a value is recomputed once it is older than ttl seconds"""
+
+    def __init__(self, ttl: float = 30):
+        self.ttl = ttl
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """Return the cached value for key, calling compute() if it is missing or stale"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+        if item is not None and now - item[0] < self.ttl:
+            return item[1]
+
+        value = compute()
+        with self._lock:
+            self._items[key] = (now, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import hashlib
+import threading
+import logging
+import numpy as np
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DTYPES = ("float16", "int8", "float32")
+
+def _encode_vector(embedding: List[float], dtype: str) -> bytes:
+    """Serialize an embedding for the cache in the given storage format"""
+    vec = np.asarray(embedding, dtype=np.float32)
+    if dtype == "int8":
+        # Symmetric quantization: 4-byte float32 scale followed by the int8 values
+        scale = np.float32(np.abs(vec).max() / 127) if vec.size else np.float32(0)
+        if scale == 0:
+            scale = np.float32(1)
+        q = np.clip(np.round(vec / scale), -127, 127).astype(np.int8)
+        return scale.tobytes() + q.tobytes()
+    return vec.astype(dtype).tobytes()
+
+def _decode_vector(blob: bytes, dtype: str) -> np.ndarray:
+    """Inverse of _encode_vector, always returns float32 values"""
+    if dtype == "int8":
+        scale = np.frombuffer(blob[:4], dtype=np.float32)[0]
+        return np.frombuffer(blob[4:], dtype=np.int8).astype(np.float32) * scale
+    return np.frombuffer(blob, dtype=dtype or "float32").astype(np.float32)
+
+def cache_key(namespace: str, text: str) -> str:
+    """Cache key for a text embedded by the model identified by namespace"""
+    return f"{namespace}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+class EmbeddingCache:
+    """
+    Persistent sqlite store of embedding vectors keyed by cache_key()
+
+    Storage format for cached vectors: float16 (default), int8 (+ per-row scale) or float32.
+    Vectors are always returned as float32 values, only the on-disk copy is quantized.
+    """
+
+    def __init__(self, path: str, dtype: str = "float16"):
+        if dtype not in CACHE_DTYPES:
+            raise ValueError(f"Unsupported cache_dtype '{dtype}', expected one of {CACHE_DTYPES}")
+        self.path = path
+        self.dtype = dtype
+        self._lock = threading.Lock()
+        self._db = self._open()
+
+    def _open(self) -> Optional[sqlite3.Connection]:
+        """Open (or create) the sqlite database, or None if it can't be used"""
+        try:
+            cache_dir = os.path.dirname(self.path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB, dtype TEXT)")
+            # Caches created before quantization support only held float32 rows
+            columns = [row[1] for row in db.execute("PRAGMA table_info(embeddings)")]
+            if "dtype" not in columns:
+                db.execute("ALTER TABLE embeddings ADD COLUMN dtype TEXT DEFAULT 'float32'")
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache disabled ({self.path}): {e}")
+            return None
+
+    def get(self, keys: List[str]) -> dict:
+        """Fetch cached vectors for the given keys, returns {key: embedding}"""
+        if self._db is None or not keys:
+            return {}
+
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay well under sqlite's bound-parameter limit
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, vec, dtype FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob, dtype in rows:
+                    found[key] = _decode_vector(blob, dtype)
+        return found
+
+    def put(self, items: List[tuple]) -> None:
+        """Store (key, embedding) pairs in a single transaction"""
+        if self._db is None or not items:
+            return
+
+        rows = [(key, _encode_vector(embedding, self.dtype), self.dtype) for key, embedding in items]
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.executemany("INSERT OR REPLACE INTO embeddings (key, vec, dtype) VALUES (?, ?, ?)", rows)
+                self._db.execute("COMMIT")
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to write embedding cache: {e}")
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
@@ -1,245 +1,229 @@
 import os
 import json
-import chromadb
+import hashlib
+import numpy as np
+from db import get_client, get_embedding_collection, mark_collection_updated, COLLECTION_NAME
 from ollama_embeddings import get_ollama_embeddings
 import logging
+from collections import Counter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_json_chunks(resume_data):
-    """Convert structured JSON resume data into optimized chunks for RAG"""
-    chunks = []
-
-    personal = resume_data.get('personal_info', {})
-    name = personal.get('name', 'Unknown')
-
-    # 1. Personal Information Chunk
-    if personal.get('name'):
-        personal_info = []
-        if personal.get('name'):
-            personal_info.append(f"Name: {personal['name']}")
-        if personal.get('title'):
-            personal_info.append(f"Title: {personal['title']}")
-        if personal.get('email'):
-            personal_info.append(f"Email: {personal['email']}")
-        if personal.get('location'):
-            personal_info.append(f"Location: {personal['location']}")
-        if personal.get('website'):
-            personal_info.append(f"Website: {personal['website']}")
-        if personal.get('linkedin'):
-            personal_info.append(f"LinkedIn: {personal['linkedin']}")
-        if personal.get('github'):
-            personal_info.append(f"GitHub: {personal['github']}")
-
-        personal_chunk = {
-            'text': f"Personal Information:\n" + "\n".join(personal_info) + f"\n\n{name} is an experienced software engineer based in {personal.get('location', 'Australia')}.",
-            'metadata': {'section': 'personal', 'type': 'contact_info', 'person': name, 'source': 'personal_info'}
-        }
-        chunks.append(personal_chunk)
-
-    # 2. Professional Summary Chunk
-    if resume_data.get('professional_summary'):
-        summary = resume_data['professional_summary']
-        summary_text = f"Professional Summary:\nTitle: {summary.get('title', '')}\n\n{summary.get('description', '')}"
-
-        summary_chunk = {
-            'text': summary_text,
-            'metadata': {'section': 'summary', 'type': 'overview', 'person': name, 'source': 'professional_summary'}
-        }
-        chunks.append(summary_chunk)
-
-    # 3. Work Experience Chunks (one per company)
-    work_experience = resume_data.get('work_experience', [])
-    for exp in work_experience:
-        company_name = exp.get('company', 'Unknown Company')
-        position = exp.get('position', 'Unknown Position')
-        duration = exp.get('duration', 'Unknown Duration')
-        location = exp.get('location', '')
-        company_desc = exp.get('company_description', '')
-
-        # Build experience text (make it more searchable with company keywords)
-        experience_text = f"Work Experience and Employment History:\nCompany: {company_name}\nEmployer: {company_name}\nPosition: {position}\nJob Title: {position}\nDuration: {duration}\nEmployee: {name}"
-        if location:
-            experience_text += f"\nLocation: {location}"
-        if company_desc:
-            experience_text += f"\n\nCompany Description: {company_desc}"
-
-        # Add current employment indicators
-        is_current = "Present" in duration or "present" in duration.lower()
-        if is_current:
-            experience_text += f"\n\nCURRENT EMPLOYMENT STATUS: {name} is currently working at {company_name} as a {position}. This is his current job and present employer."
-
-        # Add achievements
-        achievements = exp.get('achievements', [])
-        if achievements:
-            experience_text += "\n\nKey Achievements and Responsibilities:"
-            for achievement in achievements:
-                experience_text += f"\n• {achievement}"
-
-        # Add technologies
-        technologies = exp.get('technologies', [])
-        if technologies:
-            experience_text += f"\n\nTechnologies Used: {', '.join(technologies)}"
-
-        if is_current:
-            experience_text += f"\n\n{name} is currently employed at {company_name} company as a {position} since {duration.split(' - ')[0]}. This is his current position and present job."
-        else:
-            experience_text += f"\n\n{name} worked at {company_name} company as a {position} {duration}. This employment experience shows {name} has professional work experience at {company_name}."
-
-        company_chunk = {
-            'text': experience_text,
-            'metadata': {
-                'section': 'experience',
-                'type': 'company',
-                'company_name': company_name,
-                'position': position,
-                'duration': duration,
-                'person': name,
-                'source': 'work_experience'
-            }
-        }
-        chunks.append(company_chunk)
-
-    # 4. Education Chunks
-    education = resume_data.get('education', [])
-    for edu in education:
-        institution = edu.get('institution', 'Unknown Institution')
-        degree = edu.get('degree', 'Unknown Degree')
-        duration = edu.get('duration', 'Unknown Duration')
-        location = edu.get('location', '')
-        major = edu.get('major', '')
-        details = edu.get('details', '')
-
-        education_text = f"Education Background:\nInstitution: {institution}\nDegree: {degree}"
-        if major:
-            education_text += f"\nMajor: {major}"
-        education_text += f"\nDuration: {duration}"
-        if location:
-            education_text += f"\nLocation: {location}"
-        if details:
-            education_text += f"\n\nDetails: {details}"
-
-        education_text += f"\n\n{name} studied at {institution} and earned a {degree}."
-
-        education_chunk = {
-            'text': education_text,
-            'metadata': {
-                'section': 'education',
-                'type': 'academic',
-                'institution': institution,
-                'degree': degree,
-                'duration': duration,
-                'person': name,
-                'source': 'education'
-            }
-        }
-        chunks.append(education_chunk)
-
-    # 5. Technical Skills Chunks (organized by category)
-    technical_skills = resume_data.get('technical_skills', {})
+# Chunks per ChromaDB upsert call
+UPSERT_BATCH_SIZE = 250
+
+# "Label: value" lines rendered for the personal information chunk, in order
+PERSONAL_FIELDS = [
+    ('name', 'Name'), ('title', 'Title'), ('email', 'Email'), ('location', 'Location'),
+    ('website', 'Website'), ('linkedin', 'LinkedIn'), ('github', 'GitHub')
+]
+
+def _personal_text(personal, name):
+    get = personal.get
+    lines = [f"{label}: {get(key)}" for key, label in PERSONAL_FIELDS if get(key)]
+    return "\n".join(["Personal Information:", *lines, f"\n{name} is an experienced software engineer based in {get('location', 'Australia')}."])
+
+def _summary_text(summary, name):
+    return "\n".join(["Professional Summary:", f"Title: {summary.get('title', '')}", "", summary.get('description', '')])
+
+def _experience_text(exp, name):
+    get = exp.get
+    company_name = get('company', 'Unknown Company')
+    position = get('position', 'Unknown Position')
+    duration = get('duration', 'Unknown Duration')
+    location = get('location', '')
+    company_desc = get('company_description', '')
+
+    # Build experience text (make it more searchable with company keywords)
+    parts = [
+        "Work Experience and Employment History:",
+        f"Company: {company_name}",
+        f"Employer: {company_name}",
+        f"Position: {position}",
+        f"Job Title: {position}",
+        f"Duration: {duration}",
+        f"Employee: {name}"
+    ]
+    if location:
+        parts.append(f"Location: {location}")
+    if company_desc:
+        parts.append(f"\nCompany Description: {company_desc}")
+
+    # Add current employment indicators
+    is_current = "Present" in duration or "present" in duration.lower()
+    if is_current:
+        parts.append(f"\nCURRENT EMPLOYMENT STATUS: {name} is currently working at {company_name} as a {position}. This is his current job and present employer.")
+
+    # Add achievements
+    achievements = get('achievements', [])
+    if achievements:
+        parts.append("\nKey Achievements and Responsibilities:")
+        parts.extend(f"• {achievement}" for achievement in achievements)
+
+    # Add technologies
+    technologies = get('technologies', [])
+    if technologies:
+        parts.append(f"\nTechnologies Used: {', '.join(technologies)}")
+
+    if is_current:
+        parts.append(f"\n{name} is currently employed at {company_name} company as a {position} since {duration.split(' - ')[0]}. This is his current position and present job.")
+    else:
+        parts.append(f"\n{name} worked at {company_name} company as a {position} {duration}. This employment experience shows {name} has professional work experience at {company_name}.")
+
+    return "\n".join(parts)
+
+def _education_text(edu, name):
+    get = edu.get
+    institution = get('institution', 'Unknown Institution')
+    degree = get('degree', 'Unknown Degree')
+    major = get('major', '')
+    location = get('location', '')
+    details = get('details', '')
+
+    parts = ["Education Background:", f"Institution: {institution}", f"Degree: {degree}"]
+    if major:
+        parts.append(f"Major: {major}")
+    parts.append(f"Duration: {get('duration', 'Unknown Duration')}")
+    if location:
+        parts.append(f"Location: {location}")
+    if details:
+        parts.append(f"\nDetails: {details}")
+
+    parts.append(f"\n{name} studied at {institution} and earned a {degree}.")
+    return "\n".join(parts)
+
+def _skill_groups(technical_skills):
+    """Flatten {category: [{'category': ..., 'skills': [...]}, ...]} into non-empty skill groups"""
     for category_name, category_data in technical_skills.items():
         if isinstance(category_data, list):
             for skill_group in category_data:
-                if isinstance(skill_group, dict):
-                    group_name = skill_group.get('category', category_name)
-                    skills = skill_group.get('skills', [])
-
-                    if skills:
-                        skills_text = f"Technical Skills - {group_name}:\n{name} is proficient in: {', '.join(skills)}"
-
-                        skills_chunk = {
-                            'text': skills_text,
-                            'metadata': {
-                                'section': 'skills',
-                                'type': 'technical_skills',
-                                'category': group_name,
-                                'person': name,
-                                'source': 'technical_skills'
-                            }
-                        }
-                        chunks.append(skills_chunk)
-
-    # 6. Projects Chunks
-    projects = resume_data.get('projects', [])
-    for project in projects:
-        project_name = project.get('name', 'Unknown Project')
-        duration = project.get('duration', 'Unknown Duration')
-        project_type = project.get('type', 'Project')
-        description = project.get('description', '')
-
-        project_text = f"Project: {project_name}\nType: {project_type}\nDuration: {duration}\n\nDescription: {description}"
-
-        # Add key features if available
-        key_features = project.get('key_features', [])
-        if key_features:
-            project_text += "\n\nKey Features:"
-            for feature in key_features:
-                project_text += f"\n• {feature}"
-
-        # Add technologies
-        technologies = project.get('technologies', [])
-        if technologies:
-            project_text += f"\n\nTechnologies: {', '.join(technologies)}"
-
-        # Add achievement/impact
-        achievement = project.get('achievement', '')
-        impact = project.get('impact', '')
-        if achievement:
-            project_text += f"\n\nAchievement: {achievement}"
-        if impact:
-            project_text += f"\n\nImpact: {impact}"
-
-        project_chunk = {
-            'text': project_text,
-            'metadata': {
-                'section': 'projects',
-                'type': 'project',
-                'project_name': project_name,
-                'project_type': project_type,
-                'person': name,
-                'source': 'projects'
-            }
-        }
-        chunks.append(project_chunk)
-
-    # 7. Certifications Chunk
-    certifications = resume_data.get('certifications', [])
-    if certifications:
-        cert_text = f"Certifications:\n{name} holds the following certifications:\n"
-        for cert in certifications:
-            cert_name = cert.get('name', 'Unknown Certification')
-            issuer = cert.get('issuer', 'Unknown Issuer')
-            validity = cert.get('validity', '')
-            status = cert.get('status', '')
-            description = cert.get('description', '')
-            credlyUrl = cert.get('credlyUrl', '')
-
-            cert_text += f"\n• {cert_name} - {issuer}"
-            if validity:
-                cert_text += f" (Valid: {validity})"
-            if status:
-                cert_text += f" - Status: {status}"
-            if description:
-                cert_text += f"\n  {description}"
-            if credlyUrl:
-                cert_text += f"\n Credly Badge URL: {credlyUrl}"
-
-        cert_chunk = {
-            'text': cert_text,
-            'metadata': {'section': 'certifications', 'type': 'credentials', 'person': name, 'source': 'certifications'}
-        }
-        chunks.append(cert_chunk)
-
-    # 8. Interests Chunk
-    interests = resume_data.get('interests', [])
-    if interests:
-        interests_text = f"Personal Interests:\n{name} is interested in: {', '.join(interests)}"
-        interests_chunk = {
-            'text': interests_text,
-            'metadata': {'section': 'interests', 'type': 'hobbies', 'person': name, 'source': 'interests'}
-        }
-        chunks.append(interests_chunk)
+                if isinstance(skill_group, dict) and skill_group.get('skills'):
+                    yield {'category': skill_group.get('category', category_name), 'skills': skill_group['skills']}
+
+def _skills_text(group, name):
+    return f"Technical Skills - {group['category']}:\n{name} is proficient in: {', '.join(group['skills'])}"
+
+def _project_text(project, name):
+    get = project.get
+    parts = [
+        f"Project: {get('name', 'Unknown Project')}",
+        f"Type: {get('type', 'Project')}",
+        f"Duration: {get('duration', 'Unknown Duration')}",
+        f"\nDescription: {get('description', '')}"
+    ]
+
+    # Add key features if available
+    key_features = get('key_features', [])
+    if key_features:
+        parts.append("\nKey Features:")
+        parts.extend(f"• {feature}" for feature in key_features)
+
+    # Add technologies
+    technologies = get('technologies', [])
+    if technologies:
+        parts.append(f"\nTechnologies: {', '.join(technologies)}")
+
+    # Add achievement/impact
+    achievement = get('achievement', '')
+    impact = get('impact', '')
+    if achievement:
+        parts.append(f"\nAchievement: {achievement}")
+    if impact:
+        parts.append(f"\nImpact: {impact}")
+
+    return "\n".join(parts)
+
+def _certifications_text(certifications, name):
+    parts = ["Certifications:", f"{name} holds the following certifications:", ""]
+    for cert in certifications:
+        get = cert.get
+        validity = get('validity', '')
+        status = get('status', '')
+        description = get('description', '')
+        credly_url = get('credlyUrl', '')
+
+        cert_line = f"• {get('name', 'Unknown Certification')} - {get('issuer', 'Unknown Issuer')}"
+        if validity:
+            cert_line += f" (Valid: {validity})"
+        if status:
+            cert_line += f" - Status: {status}"
+        parts.append(cert_line)
+        if description:
+            parts.append(f"  {description}")
+        if credly_url:
+            parts.append(f" Credly Badge URL: {credly_url}")
+
+    return "\n".join(parts)
+
+def _interests_text(interests, name):
+    return f"Personal Interests:\n{name} is interested in: {', '.join(interests)}"
+
+def _single(data):
+    """Sections that produce one chunk from the whole value (if present)"""
+    return [data] if data else []
+
+def _each(data):
+    """Sections that produce one chunk per list item"""
+    return data
+
+# Declarative description of every chunked section, in output order:
+#   key      - top-level key in the resume JSON
+#   items    - turns the section value into the items that each become one chunk
+#   text     - builds the chunk text from (item, person name)
+#   metadata - static metadata for the section
+#   fields   - per-item metadata as (metadata key, item key, default)
+SECTION_SPECS = [
+    {'key': 'personal_info', 'items': lambda personal: _single(personal if personal.get('name') else None),
+     'text': _personal_text, 'metadata': {'section': 'personal', 'type': 'contact_info'}},
+    {'key': 'professional_summary', 'items': _single,
+     'text': _summary_text, 'metadata': {'section': 'summary', 'type': 'overview'}},
+    {'key': 'work_experience', 'default': [], 'items': _each,
+     'text': _experience_text, 'metadata': {'section': 'experience', 'type': 'company'},
+     'fields': [('company_name', 'company', 'Unknown Company'), ('position', 'position', 'Unknown Position'),
+                ('duration', 'duration', 'Unknown Duration')]},
+    {'key': 'education', 'default': [], 'items': _each,
+     'text': _education_text, 'metadata': {'section': 'education', 'type': 'academic'},
+     'fields': [('institution', 'institution', 'Unknown Institution'), ('degree', 'degree', 'Unknown Degree'),
+                ('duration', 'duration', 'Unknown Duration')]},
+    {'key': 'technical_skills', 'items': _skill_groups,
+     'text': _skills_text, 'metadata': {'section': 'skills', 'type': 'technical_skills'},
+     'fields': [('category', 'category', '')]},
+    {'key': 'projects', 'default': [], 'items': _each,
+     'text': _project_text, 'metadata': {'section': 'projects', 'type': 'project'},
+     'fields': [('project_name', 'name', 'Unknown Project'), ('project_type', 'type', 'Project')]},
+    {'key': 'certifications', 'default': [], 'items': _single,
+     'text': _certifications_text, 'metadata': {'section': 'certifications', 'type': 'credentials'}},
+    {'key': 'interests', 'default': [], 'items': _single,
+     'text': _interests_text, 'metadata': {'section': 'interests', 'type': 'hobbies'}},
+]
+
+def build_chunks(section_data, spec, name):
+    """Build the chunks for one section described by a SECTION_SPECS entry"""
+    chunks = []
+    text_fn = spec['text']
+    static_metadata = spec['metadata']
+    fields = spec.get('fields', ())
+    source = spec['key']
+
+    for item in spec['items'](section_data):
+        metadata = dict(static_metadata)
+        for meta_key, item_key, default in fields:
+            metadata[meta_key] = item.get(item_key, default)
+        metadata['person'] = name
+        metadata['source'] = source
+
+        chunks.append({'text': text_fn(item, name), 'metadata': metadata})
+
+    return chunks
+
+def create_json_chunks(resume_data):
+    """Convert structured JSON resume data into optimized chunks for RAG"""
+    name = resume_data.get('personal_info', {}).get('name', 'Unknown')
+
+    chunks = []
+    for spec in SECTION_SPECS:
+        chunks.extend(build_chunks(resume_data.get(spec['key'], spec.get('default', {})), spec, name))
 
     return chunks
 
@@ -260,14 +244,15 @@ def ingest_json_resume(json_path: str, chroma_db_path: str = "./data/chroma_db")
 
     # Create optimized chunks
     chunks = create_json_chunks(resume_data)
-    logger.info(f"Created {len(chunks)} optimized chunks")
+    logger.info("Created %d chunks across sections: %s", len(chunks), dict(Counter(c['metadata']['section'] for c in chunks)))
 
     # Display chunk summary
-    for i, chunk in enumerate(chunks):
-        section = chunk['metadata'].get('section', 'unknown')
-        chunk_type = chunk['metadata'].get('type', 'unknown')
-        preview = chunk['text'][:100].replace('\n', ' ')
-        logger.info(f"  Chunk {i+1}: {section}/{chunk_type} - {preview}...")
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, chunk in enumerate(chunks):
+            section = chunk['metadata'].get('section', 'unknown')
+            chunk_type = chunk['metadata'].get('type', 'unknown')
+            preview = chunk['text'][:100].replace('\n', ' ')
+            logger.debug(f"  Chunk {i+1}: {section}/{chunk_type} - {preview}...")
 
     # Initialize Ollama embedding model
     logger.info("Initializing Ollama bge-m3 embeddings...")
@@ -278,38 +263,64 @@ def ingest_json_resume(json_path: str, chroma_db_path: str = "./data/chroma_db")
         logger.error("Failed to connect to Ollama bge-m3 model. Make sure Ollama is running and bge-m3:latest is available.")
         return False
 
-    # Initialize ChromaDB (match universal_ingest.py exactly)
-    os.makedirs(chroma_db_path, exist_ok=True)
-    chroma_client = chromadb.PersistentClient(path=chroma_db_path)
-
-    # Create or reset collection (match universal_ingest.py exactly)
-    try:
-        collection = chroma_client.delete_collection("resume_knowledge")
-        logger.info("Deleted existing collection")
-    except:
-        pass
-
-    collection = chroma_client.create_collection("resume_knowledge")
-    logger.info("Created new collection")
-
-    # Generate embeddings and store
-    documents = [chunk['text'] for chunk in chunks]
-    metadatas = [chunk['metadata'] for chunk in chunks]
-    ids = [f"json_chunk_{i}" for i in range(len(chunks))]
+    # Initialize ChromaDB
+    chroma_client = get_client(chroma_db_path)
+
+    # Reuse the existing collection so unchanged chunks don't trigger an index rebuild
+    # (it is recreated if another embedding model filled it)
+    collection = get_embedding_collection(chroma_client, "bge-m3:latest")
+
+    # Stable content-derived ids - edits to the resume only touch the affected rows
+    ids, documents, metadatas = [], [], []
+    seen_ids = set()
+    for chunk in chunks:
+        chunk_id = f"{chunk['metadata'].get('section', 'unknown')}:{hashlib.sha256(chunk['text'].encode()).hexdigest()[:16]}"
+        if chunk_id in seen_ids:
+            continue
+        seen_ids.add(chunk_id)
+        ids.append(chunk_id)
+        documents.append(chunk['text'])
+        metadatas.append(chunk['metadata'])
+
+    # Drop rows from a previous ingest that no longer exist in the resume
+    existing_ids = set(collection.get(include=[])['ids'])
+    stale_ids = list(existing_ids - seen_ids)
+    if stale_ids:
+        collection.delete(ids=stale_ids)
+        mark_collection_updated(chroma_db_path)
+        logger.info(f"Removed {len(stale_ids)} stale chunks")
+
+    new_indices = [i for i, chunk_id in enumerate(ids) if chunk_id not in existing_ids]
+    if not new_indices:
+        logger.info("Collection already up to date - nothing to embed")
+        return True
+
+    documents = [documents[i] for i in new_indices]
+    metadatas = [metadatas[i] for i in new_indices]
+    ids = [ids[i] for i in new_indices]
 
     # Generate embeddings using Ollama bge-m3
     logger.info(f"Generating embeddings for {len(documents)} documents using bge-m3...")
-    embeddings = embedding_model.encode(documents)
-
-    # Store in ChromaDB
-    collection.add(
-        embeddings=embeddings,  # Ollama embeddings are already lists
-        documents=documents,
-        metadatas=metadatas,
-        ids=ids
-    )
-
-    logger.info(f"Successfully ingested {len(chunks)} JSON chunks into ChromaDB")
+    unique_documents, inverse = np.unique(np.asarray(documents, dtype=object), return_inverse=True)
+    if len(unique_documents) < len(documents):
+        # Embed each distinct text once and expand back to one row per chunk
+        logger.info(f"Embedding {len(unique_documents)} distinct texts for {len(documents)} chunks")
+        embeddings = embedding_model.encode(unique_documents.tolist())[inverse]
+    else:
+        embeddings = embedding_model.encode(documents)
+
+    # Store in ChromaDB, in batches so large inputs stay within Chroma's sweet spot
+    for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+        end = start + UPSERT_BATCH_SIZE
+        collection.upsert(
+            ids=ids[start:end],
+            embeddings=embeddings[start:end].tolist(),
+            documents=documents[start:end],
+            metadatas=metadatas[start:end]
+        )
+    mark_collection_updated(chroma_db_path)
+
+    logger.info(f"Successfully ingested {len(ids)} new JSON chunks into ChromaDB ({collection.count()} total)")
     return True
 
 def main():
@@ -326,8 +337,8 @@ def main():
         print("✅ JSON resume ingestion completed successfully!")
 
         # Test retrieval with various queries
-        chroma_client = chromadb.PersistentClient(path="./data/chroma_db")
-        collection = chroma_client.get_collection("resume_knowledge")
+        chroma_client = get_client("./data/chroma_db")
+        collection = chroma_client.get_collection(COLLECTION_NAME)
 
         print(f"\n📊 Collection stats: {collection.count()} documents")
 
@@ -343,16 +354,17 @@ def main():
             "What projects has Nirwan worked on?"
         ]
 
-        for query in test_queries:
-            print(f"\n🔍 Test query: '{query}'")
-            query_embedding = embedding_model.encode([query])
+        # Embed and search all test queries in one request each
+        query_embeddings = embedding_model.encode(test_queries)
+        results = collection.query(
+            query_embeddings=query_embeddings,
+            n_results=2
+        )
 
-            results = collection.query(
-                query_embeddings=query_embedding,  # Already a list from Ollama
-                n_results=2
-            )
+        for query, documents, metadatas in zip(test_queries, results['documents'], results['metadatas']):
+            print(f"\n🔍 Test query: '{query}'")
 
-            for i, (doc, meta) in enumerate(zip(results['documents'][0], results['metadatas'][0])):
+            for i, (doc, meta) in enumerate(zip(documents, metadatas)):
                 section = meta.get('section', 'unknown')
                 chunk_type = meta.get('type', 'unknown')
                 source = meta.get('source', 'unknown')
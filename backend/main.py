@@ -1,13 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-import chromadb
-from ollama_embeddings import get_ollama_embeddings
-import requests
+from starlette.concurrency import run_in_threadpool
+from db import get_client, collection_version, TTLCache, COLLECTION_NAME, COLLECTION_METADATA
+from ollama_embeddings import get_ollama_embeddings, AsyncBatcher
+import asyncio
+import httpx
 import json
+import secrets
 import os
+import re
 import logging
+from collections import OrderedDict
+import numpy as np
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -29,19 +36,88 @@ app.mount("/static", StaticFiles(directory="frontend"), name="static")
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 MODEL_NAME = os.getenv("MODEL_NAME", "deepseek-r1:1.5b")
 CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", "./data/chroma_db")
+# Required by the /admin routes when set, otherwise they only accept local clients
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# Shared keep-alive async client for Ollama requests
+_aio_client = httpx.AsyncClient(base_url=OLLAMA_URL, timeout=120)
 
 # Initialize components
 logger.info("Initializing Ollama bge-m3 embeddings...")
 embedding_model = get_ollama_embeddings("bge-m3:latest")
-chroma_client = chromadb.PersistentClient(path=CHROMA_DB_PATH)
+# Coalesces concurrent /chat query embeddings into single /api/embed calls
+query_batcher = AsyncBatcher(embedding_model, max_batch=32, max_wait_ms=10)
+chroma_client = get_client(CHROMA_DB_PATH)
 
 try:
-    collection = chroma_client.get_collection("resume_knowledge")
+    collection = chroma_client.get_collection(COLLECTION_NAME)
     logger.info(f"Loaded existing ChromaDB collection with {collection.count()} documents")
 except Exception as e:
     logger.error(f"Failed to load ChromaDB collection: {e}")
     logger.info("Creating new empty ChromaDB collection - you may need to run ingestion script")
-    collection = chroma_client.create_collection("resume_knowledge")
+    collection = chroma_client.create_collection(COLLECTION_NAME, metadata=COLLECTION_METADATA)
+
+# /health reads the document count from here instead of hitting sqlite every call
+_health_cache = TTLCache(ttl=30)
+
+def _cached_count() -> int:
+    return _health_cache.get("count", collection.count)
+
+# The resume collection is tiny (tens of chunks), so retrieval runs as a NumPy
+# dot product over an in-memory copy instead of a Chroma query per request.
+# Chroma stays the persistent store; the copy is reloaded when an ingest script
+# updates the collection (see refresh_index).
+_index = {"embeddings": np.empty((0, 0), dtype=np.float32), "documents": [], "metadatas": []}
+_index_version = ""
+_reload_lock = asyncio.Lock()
+
+def load_index() -> int:
+    """(Re)build the in-memory retrieval index from the Chroma collection"""
+    global _index, _index_version, collection
+    # Read the stamp first, so an ingest that finishes during the load triggers another one
+    _index_version = collection_version(CHROMA_DB_PATH)
+    try:
+        # The ingest scripts recreate the collection when the embedding model changes
+        collection = chroma_client.get_collection(COLLECTION_NAME)
+    except Exception as e:
+        logger.warning(f"Keeping the current ChromaDB collection handle: {e}")
+    raw = collection.get(include=["embeddings", "documents", "metadatas"])
+
+    embeddings = np.asarray(raw["embeddings"] if raw["embeddings"] is not None else [], dtype=np.float32)
+    if embeddings.size:
+        # L2-normalize rows so a dot product gives cosine similarity
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1, norms)
+
+    _index = {
+        "embeddings": embeddings,
+        "documents": raw["documents"] or [],
+        "metadatas": raw["metadatas"] or [{} for _ in raw["ids"]]
+    }
+    logger.info(f"Loaded {len(_index['documents'])} chunks into the in-memory retrieval index")
+    return len(_index["documents"])
+
+load_index()
+
+async def refresh_index() -> None:
+    """Reload the in-memory index if the collection was re-ingested since it was loaded"""
+    if collection_version(CHROMA_DB_PATH) == _index_version:
+        return
+    async with _reload_lock:
+        # Another request may have reloaded while this one waited
+        if collection_version(CHROMA_DB_PATH) != _index_version:
+            logger.info("ChromaDB collection changed, reloading the retrieval index")
+            await run_in_threadpool(load_index)
+            _health_cache.clear()
+
+# Question classifiers, compiled once
+GREETINGS = frozenset({"hi", "hello", "hey", "howdy"})
+CURRENT_RE = re.compile(r"\b(current|currently|now|present)\b", re.I)
+# Trailing \w* keeps matching "worked", "working", "experiences", ...
+COMPANY_RE = re.compile(r"\b(company|companies|work\w*|employer\w*|experience\w*)", re.I)
+# Requests the prompt tells the model to refuse - answered without calling Ollama
+OFF_TOPIC_RE = re.compile(r"\b(joke|story|poem|sing|rap|pretend|roleplay|weather)\b", re.I)
+OFF_TOPIC_ANSWER = "I can only help with resume and career questions."
 
 class ChatRequest(BaseModel):
     question: str
@@ -50,55 +126,194 @@ class ChatResponse(BaseModel):
     answer: str
     sources: list = []
 
-def get_relevant_context(question: str, top_k: int = 2) -> tuple[str, list]:
-    query_embedding = embedding_model.encode([question])
+# Memoized query embeddings keyed by stripped question (LRU)
+QUERY_CACHE_SIZE = 512
+_query_embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+async def embed_query(question: str) -> np.ndarray:
+    """Embed a question, memoized so repeated questions skip Ollama"""
+    # Keyed on the original casing; the embedding model is case-sensitive
+    question = question.strip()
+    embedding = _query_embedding_cache.get(question)
+    if embedding is not None:
+        _query_embedding_cache.move_to_end(question)
+        return embedding
+
+    embedding = await query_batcher.submit(question)
+    _query_embedding_cache[question] = embedding
+    if len(_query_embedding_cache) > QUERY_CACHE_SIZE:
+        _query_embedding_cache.popitem(last=False)
+    return embedding
+
+def search_collection(query_embedding: np.ndarray, top_k: int = 2) -> tuple[str, list]:
+    index = _index
+    embeddings = index["embeddings"]
+    if not len(index["documents"]):
+        return "No relevant context found.", []
 
-    results = collection.query(
-        query_embeddings=query_embedding,  # Already a list from Ollama
-        n_results=top_k
-    )
+    # Copy - the caller's vector is memoized and must not be normalized in place
+    query = np.array(query_embedding, dtype=np.float32)
+    query /= np.linalg.norm(query) or 1
+    scores = embeddings @ query
 
-    if not results['documents'] or not results['documents'][0]:
-        return "No relevant context found.", []
+    # Best top_k rows, highest similarity first
+    top_k = min(top_k, len(scores))
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    top = top[np.argsort(-scores[top])]
 
-    context_parts = []
-    sources = []
+    documents = index["documents"]
+    metadatas = index["metadatas"]
 
-    for i, doc in enumerate(results['documents'][0]):
-        # Use more context but still limit for performance
-        truncated_doc = doc[:500] + "..." if len(doc) > 500 else doc
-        context_parts.append(truncated_doc)
-        if results['metadatas'] and results['metadatas'][0]:
-            sources.append(results['metadatas'][0][i].get('source', 'Resume'))
+    # Use more context but still limit for performance
+    docs = [documents[i] for i in top]
+    context_parts = [doc if len(doc) <= 500 else doc[:500] + "..." for doc in docs]
+    sources = [(metadatas[i] or {}).get('source', 'Resume') for i in top]
 
     return "\n\n".join(context_parts), sources
 
-def query_ollama(prompt: str) -> str:
+async def get_relevant_context(question: str, top_k: int = 2) -> tuple[str, list]:
+    query_embedding = await embed_query(question)
+    await refresh_index()
+    return search_collection(query_embedding, top_k)
+
+# Constant instructions go in Ollama's "system" field: the prefix stays identical
+# across requests so Ollama can reuse its prompt cache, and only the question +
+# context are rendered per request.
+SYSTEM_PROMPT = f"""You are a professional resume assistant. Answer ONLY resume and career questions using the provided resume data.
+
+CRITICAL: If asked for jokes, stories, or casual conversation, respond EXACTLY: "{OFF_TOPIC_ANSWER}"
+
+DO NOT create content using resume data for non-professional purposes."""
+
+PROMPT_TEMPLATE = """Question: {question}
+Resume Data: {context}
+
+Professional Answer:"""
+
+def _generate_payload(prompt: str, stream: bool) -> dict:
+    return {
+        "model": MODEL_NAME,
+        "system": SYSTEM_PROMPT,
+        "prompt": prompt,
+        "stream": stream,
+        "options": {
+            "temperature": 0.0,
+            "top_p": 0.3,
+            "max_tokens": 200
+        }
+    }
+
+class OllamaError(Exception):
+    """Ollama failed to generate an answer; the message is safe to show to users"""
+
+async def query_ollama(prompt: str) -> str:
     try:
-        response = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": MODEL_NAME,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.0,
-                    "top_p": 0.3,
-                    "max_tokens": 200
-                }
-            },
-            timeout=120
+        response = await _aio_client.post(
+            "/api/generate",
+            json=_generate_payload(prompt, stream=False)
         )
-        
-        if response.status_code == 200:
-            return response.json()["response"].strip()
-        else:
-            logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-            return "Sorry, I'm having trouble processing your request right now."
-            
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
+        logger.error(f"Request error: {e}")
+        raise OllamaError("Sorry, I'm having trouble connecting to the AI service.") from e
+
+    if response.status_code != 200:
+        logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+        raise OllamaError("Sorry, I'm having trouble processing your request right now.")
+    return response.json()["response"].strip()
+
+async def query_ollama_stream(prompt: str):
+    """Stream generated text from Ollama chunk by chunk (raises OllamaError on failure)"""
+    try:
+        async with _aio_client.stream(
+            "POST",
+            "/api/generate",
+            json=_generate_payload(prompt, stream=True)
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                raise OllamaError("Sorry, I'm having trouble processing your request right now.")
+
+            async for line in response.aiter_lines():
+                if line:
+                    data = json.loads(line)
+                    # Generation failures after the 200 status arrive as an error line
+                    if "error" in data:
+                        logger.error(f"Ollama stream error: {data['error']}")
+                        raise OllamaError("Sorry, I'm having trouble processing your request right now.")
+                    yield data.get("response", "")
+
+    except httpx.HTTPError as e:
         logger.error(f"Request error: {e}")
-        return "Sorry, I'm having trouble connecting to the AI service."
+        raise OllamaError("Sorry, I'm having trouble connecting to the AI service.") from e
+
+async def start_stream(chunks):
+    """
+    Wait for the first chunk of a stream before responding
+
+    A failure to start then raises here and becomes an error status, rather than
+    apology text in a 200 response that clients can't tell from an answer. Failures
+    after that abort the response, so the client sees an incomplete stream.
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = ""
+
+    async def resumed():
+        if first:
+            yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return resumed()
+
+def _partial_tag_len(buffer: str, tag: str) -> int:
+    """Length of the longest prefix of tag that buffer ends with"""
+    for length in range(min(len(tag) - 1, len(buffer)), 0, -1):
+        if buffer.endswith(tag[:length]):
+            return length
+    return 0
+
+async def strip_think_stream(chunks):
+    """Drop <think>...</think> sections from a text stream (tags may be split across chunks)"""
+    buffer = ""
+    in_think = False
+    started = False
+
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            tag = "</think>" if in_think else "<think>"
+            index = buffer.find(tag)
+            if index == -1:
+                # Hold back anything that could be the start of a tag
+                keep = _partial_tag_len(buffer, tag)
+                text, buffer = buffer[:len(buffer) - keep], buffer[len(buffer) - keep:]
+            else:
+                text, buffer = buffer[:index], buffer[index + len(tag):]
+
+            # Text inside <think> is dropped
+            if not in_think and text:
+                if not started:
+                    # Match the non-streaming answer, which is stripped
+                    text = text.lstrip()
+                    started = bool(text)
+                if text:
+                    yield text
+
+            if index == -1:
+                break
+            in_think = not in_think
+
+    if buffer and not in_think:
+        yield buffer
+
+@app.on_event("shutdown")
+async def shutdown():
+    await query_batcher.close()
+    await _aio_client.aclose()
+    await embedding_model.aclose()
 
 @app.get("/")
 async def root():
@@ -109,85 +324,131 @@ async def root():
 async def health():
     try:
         # Test Ollama connection
-        response = requests.get(f"{OLLAMA_URL}/api/version", timeout=5)
+        response = await _aio_client.get("/api/version", timeout=5)
         ollama_status = "healthy" if response.status_code == 200 else "unhealthy"
     except:
         ollama_status = "unhealthy"
     
     # Test ChromaDB
     try:
-        collection.count()
+        collection_count = _cached_count()
         chroma_status = "healthy"
     except:
+        collection_count = 0
         chroma_status = "unhealthy"
     
     return {
         "status": "healthy" if ollama_status == "healthy" and chroma_status == "healthy" else "unhealthy",
         "ollama": ollama_status,
         "chromadb": chroma_status,
-        "collection_count": collection.count() if chroma_status == "healthy" else 0
+        "collection_count": collection_count
     }
 
+def require_admin(request: Request, x_admin_token: str | None = Header(None)) -> None:
+    """Allow /admin routes with the ADMIN_TOKEN header, or from localhost when no token is configured"""
+    if ADMIN_TOKEN:
+        if x_admin_token and secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+            return
+    elif request.client and request.client.host in ("127.0.0.1", "::1"):
+        return
+    raise HTTPException(status_code=403, detail="Forbidden")
+
+@app.post("/admin/clear-cache", dependencies=[Depends(require_admin)])
+async def clear_cache():
+    """Drop memoized query embeddings, e.g. after re-ingesting or changing the embedding model"""
+    cleared = len(_query_embedding_cache)
+    _query_embedding_cache.clear()
+    return {"cleared": cleared}
+
+def _reply(answer: str, sources: list, stream: bool):
+    """Fixed answers in the format the client asked for"""
+    if stream:
+        return PlainTextResponse(answer, headers={"X-Sources": json.dumps(sources)})
+    return ChatResponse(answer=answer, sources=sources)
+
+@app.post("/admin/reload-index", dependencies=[Depends(require_admin)])
+async def reload_index():
+    """Reload retrieval data from ChromaDB now (ingests are also picked up on the next question)"""
+    async with _reload_lock:
+        count = await run_in_threadpool(load_index)
+    _query_embedding_cache.clear()
+    _health_cache.clear()
+    return {"documents": count}
+
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, stream: bool = True, strip_think: bool = True):
+    """
+    Answer a question about the resume.
+
+    Streams the answer as plain text by default (sources in the X-Sources header,
+    <think> sections removed unless ?strip_think=false); pass ?stream=false for the
+    buffered JSON ChatResponse.
+    """
     try:
         # Handle simple greetings directly
-        greetings = ['hi', 'hello', 'hey', 'howdy']
         clean_question = request.question.lower().strip().rstrip('!?.')
-        if clean_question in greetings:
-            return ChatResponse(
-                answer="Hello! I'm Nirwan Raj Nagpal's resume assistant. I can help you learn about his work experience, skills, education, projects, and certifications. What would you like to know?",
-                sources=[]
+        if clean_question in GREETINGS:
+            return _reply(
+                "Hello! I'm Nirwan Raj Nagpal's resume assistant. I can help you learn about his work experience, skills, education, projects, and certifications. What would you like to know?",
+                [],
+                stream
             )
 
+        # Refuse off-topic and empty questions before paying for retrieval + generation
+        if len(clean_question) < 2 or OFF_TOPIC_RE.search(request.question):
+            return _reply(OFF_TOPIC_ANSWER, [], stream)
+
         # Get relevant context from resume - use more results for company queries and prioritize current employment
-        top_k = 6 if any(word in request.question.lower() for word in ['current', 'currently', 'now', 'present']) else 4 if any(word in request.question.lower() for word in ['company', 'companies', 'work', 'employer', 'experience']) else 2
-        context, sources = get_relevant_context(request.question, top_k)
+        question = request.question
+        top_k = 6 if CURRENT_RE.search(question) else 4 if COMPANY_RE.search(question) else 2
+        context, sources = await get_relevant_context(request.question, top_k)
 
         # Generate answer using Ollama with the retrieved context
         if not context or context == "No relevant context found.":
-            return ChatResponse(
-                answer="I don't have information about that in Nirwan's resume. Please ask about his experience, skills, education, or projects.",
-                sources=[]
+            return _reply(
+                "I don't have information about that in Nirwan's resume. Please ask about his experience, skills, education, or projects.",
+                [],
+                stream
             )
 
-        prompt = f"""You are a professional resume assistant. Answer ONLY resume and career questions using the provided resume data.
-
-CRITICAL: If asked for jokes, stories, or casual conversation, respond EXACTLY: "I can only help with resume and career questions."
-
-DO NOT create content using resume data for non-professional purposes.
-
-Question: {request.question}
-Resume Data: {context}
-
-Professional Answer:"""
+        prompt = PROMPT_TEMPLATE.format(question=request.question, context=context)
 
         # Debug logging
-        logger.info(f"Query: {request.question}")
-        logger.info(f"Context length: {len(context)}")
-        logger.info(f"Number of sources: {len(sources)}")
-        logger.info(f"Sources: {sources}")
-        logger.info(f"Context preview: {context[:500]}...")
+        logger.info(f"Query: {request.question} ({len(sources)} sources, {len(context)} chars of context)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sources: {sources}")
+            logger.debug(f"Context preview: {context[:500]}...")
+
+        if stream:
+            chunks = await start_stream(query_ollama_stream(prompt))
+            return StreamingResponse(
+                strip_think_stream(chunks) if strip_think else chunks,
+                media_type="text/plain",
+                headers={"X-Sources": json.dumps(sources)}
+            )
 
-        answer = query_ollama(prompt)
+        answer = await query_ollama(prompt)
 
         # Debug: Log the raw answer to see if it contains think tags
-        logger.info(f"Raw answer length: {len(answer)}")
-        if '<think>' in answer:
-            logger.info("Answer contains <think> tags")
-            # Log a snippet of the think content
-            think_start = answer.find('<think>')
-            think_end = answer.find('</think>') + 8
-            if think_start != -1 and think_end != -1:
-                think_snippet = answer[think_start:min(think_start + 100, think_end)]
-                logger.info(f"Think content preview: {think_snippet}...")
-        else:
-            logger.info("Answer does NOT contain <think> tags")
-
-        logger.info(f"Sending to frontend - Answer preview: {answer[:200]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Raw answer length: {len(answer)}")
+            if '<think>' in answer:
+                logger.debug("Answer contains <think> tags")
+                # Log a snippet of the think content
+                think_start = answer.find('<think>')
+                think_end = answer.find('</think>') + 8
+                if think_start != -1 and think_end != -1:
+                    think_snippet = answer[think_start:min(think_start + 100, think_end)]
+                    logger.debug(f"Think content preview: {think_snippet}...")
+            else:
+                logger.debug("Answer does NOT contain <think> tags")
+
+            logger.debug(f"Sending to frontend - Answer preview: {answer[:200]}...")
 
         return ChatResponse(answer=answer, sources=sources)
 
+    except OllamaError as e:
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         logger.error(f"Chat error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,67 +1,306 @@
 import requests
+from requests.adapters import HTTPAdapter
+import httpx
+import asyncio
 import os
+import atexit
 import logging
-from typing import List, Union
+import numpy as np
+from embedding_cache import EmbeddingCache, cache_key
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
 
 logger = logging.getLogger(__name__)
 
 class OllamaEmbeddings:
-    def __init__(self, model_name: str = "bge-m3:latest", ollama_url: str = None):
+    def __init__(self, model_name: str = "bge-m3:latest", ollama_url: str = None, parallel: int = None,
+                 cache_path: str = None, cache_dtype: str = None):
         self.model_name = model_name
         self.ollama_url = ollama_url or os.getenv("OLLAMA_URL", "http://localhost:11434")
+        # Concurrent requests for the per-text fallback. Running several requests at once
+        # (like OLLAMA_NUM_PARALLEL > 1 on the server) can make embeddings slightly less
+        # numerically consistent between runs - pass parallel=1 if reproducibility matters.
+        self.parallel = parallel or int(os.getenv("OLLAMA_NUM_PARALLEL", "8"))
 
-    def encode(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        # Keep-alive session shared by all requests (pool sized for the parallel fallback)
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+        atexit.register(self._session.close)
+        # Created lazily inside the event loop by aencode()
+        self._async_client = None
+
+        # Persistent embedding cache keyed by (model, sha256(text))
+        self.cache_path = cache_path or os.getenv("EMBED_CACHE_PATH", "./data/embed_cache.sqlite")
+        self._cache = EmbeddingCache(self.cache_path, cache_dtype or os.getenv("EMBED_CACHE_DTYPE", "float16"))
+
+    def _cache_key(self, text: str) -> str:
+        return cache_key(self.model_name, text)
+
+    def encode(self, texts: Union[str, List[str]], batch_size: int = 64) -> np.ndarray:
         """
         Generate embeddings for text(s) using Ollama bge-m3 model
 
         Args:
             texts: Single text string or list of text strings
+            batch_size: Maximum number of texts sent per /api/embed request
 
         Returns:
-            List of embedding vectors (list of floats for each text)
+            float32 array of shape (len(texts), dim), one embedding per row
         """
         # Ensure texts is a list
         if isinstance(texts, str):
             texts = [texts]
 
+        keys, cached, misses = self._split_cached(texts)
+
+        if misses:
+            self._store_fetched(cached, misses, self._fetch(list(misses.values()), batch_size))
+
+        embeddings = self._stack([cached[key] for key in keys])
+
+        logger.info(f"Generated {len(embeddings)} embeddings using {self.model_name} ({len(misses)} fetched from Ollama)")
+        return embeddings
+
+    async def aencode(self, texts: Union[str, List[str]], batch_size: int = 64) -> np.ndarray:
+        """Async variant of encode() for callers running inside an event loop"""
+        if isinstance(texts, str):
+            texts = [texts]
+
+        # The sqlite cache blocks (put() can wait on the write lock), keep it off the event loop
+        keys, cached, misses = await asyncio.to_thread(self._split_cached, texts)
+
+        if misses:
+            fetched = await self._afetch(list(misses.values()), batch_size)
+            await asyncio.to_thread(self._store_fetched, cached, misses, fetched)
+
+        embeddings = self._stack([cached[key] for key in keys])
+
+        logger.debug(f"Generated {len(embeddings)} embeddings using {self.model_name} ({len(misses)} fetched from Ollama)")
+        return embeddings
+
+    @staticmethod
+    def _stack(vectors: list) -> np.ndarray:
+        """Pack embedding vectors into one contiguous (n, dim) float32 array"""
+        if not vectors:
+            return np.empty((0, 0), dtype=np.float32)
+
+        out = np.empty((len(vectors), len(vectors[0])), dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            out[i] = vector
+        return out
+
+    def _split_cached(self, texts: List[str]) -> tuple:
+        """Look texts up in the cache, returns (keys, {key: embedding} hits, {key: text} misses)"""
+        keys = [self._cache_key(text) for text in texts]
+        cached = self._cache.get(keys)
+
+        # Only send cache misses to Ollama (each distinct text once)
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in misses:
+                misses[key] = text
+
+        return keys, cached, misses
+
+    def _store_fetched(self, cached: dict, misses: dict, fetched: List[List[float]]) -> None:
+        new_items = list(zip(misses.keys(), fetched))
+        self._cache.put(new_items)
+        cached.update(new_items)
+
+    def _fetch(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+        """Request embeddings from Ollama, batch_size texts per request"""
+        embeddings = []
+
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            batch_embeddings = self._embed_batch(batch)
+
+            # Older Ollama versions don't have /api/embed - fall back to one request per text
+            if batch_embeddings is None:
+                batch_embeddings = self._embed_parallel(batch)
+
+            embeddings.extend(batch_embeddings)
+
+        return embeddings
+
+    def _embed_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embed a batch of texts in a single /api/embed call, or None if the endpoint is unavailable"""
+        try:
+            response = self._session.post(
+                f"{self.ollama_url}/api/embed",
+                json={
+                    "model": self.model_name,
+                    "input": texts
+                },
+                timeout=120
+            )
+
+            if response.status_code == 404:
+                logger.debug("Ollama /api/embed not available, using /api/embeddings")
+                return None
+
+            if response.status_code == 200:
+                embeddings = response.json()["embeddings"]
+                logger.debug(f"Generated {len(embeddings)} embeddings in one batch request")
+                return embeddings
+            else:
+                logger.error(f"Ollama embedding API error: {response.status_code} - {response.text}")
+                raise Exception(f"Ollama API error: {response.status_code}")
+
+        except requests.RequestException as e:
+            logger.error(f"Request error while generating embeddings: {e}")
+            raise Exception(f"Ollama connection error: {str(e)}")
+
+    def _embed_parallel(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts one request each, overlapping the requests on a thread pool"""
+        if self.parallel <= 1 or len(texts) <= 1:
+            return [self._embed_one(text) for text in texts]
+
+        # ex.map preserves input order
+        with ThreadPoolExecutor(max_workers=min(self.parallel, len(texts))) as ex:
+            return list(ex.map(self._embed_one, texts))
+
+    def _embed_one(self, text: str) -> List[float]:
+        """Embed a single text using the legacy /api/embeddings endpoint"""
+        try:
+            response = self._session.post(
+                f"{self.ollama_url}/api/embeddings",
+                json={
+                    "model": self.model_name,
+                    "prompt": text
+                },
+                timeout=30
+            )
+
+            if response.status_code == 200:
+                embedding = response.json()["embedding"]
+                logger.debug(f"Generated embedding for text (length: {len(text)}, embedding dim: {len(embedding)})")
+                return embedding
+            else:
+                logger.error(f"Ollama embedding API error: {response.status_code} - {response.text}")
+                raise Exception(f"Ollama API error: {response.status_code}")
+
+        except requests.RequestException as e:
+            logger.error(f"Request error while generating embeddings: {e}")
+            raise Exception(f"Ollama connection error: {str(e)}")
+
+    async def _afetch(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+        """Async counterpart of _fetch() using a shared httpx.AsyncClient"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(base_url=self.ollama_url, timeout=120)
+
         embeddings = []
 
-        for text in texts:
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
             try:
-                response = requests.post(
-                    f"{self.ollama_url}/api/embeddings",
-                    json={
-                        "model": self.model_name,
-                        "prompt": text
-                    },
-                    timeout=30
-                )
-
-                if response.status_code == 200:
-                    embedding = response.json()["embedding"]
-                    embeddings.append(embedding)
-                    logger.debug(f"Generated embedding for text (length: {len(text)}, embedding dim: {len(embedding)})")
+                response = await self._async_client.post("/api/embed", json={"model": self.model_name, "input": batch})
+
+                if response.status_code == 404:
+                    # Older Ollama - one request per text, at most self.parallel in flight
+                    semaphore = asyncio.Semaphore(self.parallel)
+
+                    async def embed_one(text: str) -> List[float]:
+                        async with semaphore:
+                            r = await self._async_client.post("/api/embeddings", json={"model": self.model_name, "prompt": text})
+                            r.raise_for_status()
+                            return r.json()["embedding"]
+
+                    embeddings.extend(await asyncio.gather(*(embed_one(text) for text in batch)))
+                elif response.status_code == 200:
+                    embeddings.extend(response.json()["embeddings"])
                 else:
                     logger.error(f"Ollama embedding API error: {response.status_code} - {response.text}")
                     raise Exception(f"Ollama API error: {response.status_code}")
 
-            except requests.RequestException as e:
+            except httpx.HTTPError as e:
                 logger.error(f"Request error while generating embeddings: {e}")
                 raise Exception(f"Ollama connection error: {str(e)}")
 
-        logger.info(f"Generated {len(embeddings)} embeddings using {self.model_name}")
         return embeddings
 
+    async def aclose(self) -> None:
+        """Close the async HTTP client (call on application shutdown)"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def test_connection(self) -> bool:
         """Test if Ollama API and bge-m3 model are available"""
         try:
-            # Test with a simple text
-            result = self.encode(["test"])
+            # Test with a simple text (bypass the cache so Ollama is actually hit)
+            result = self._fetch(["test"])
             return len(result) > 0 and len(result[0]) > 0
         except Exception as e:
             logger.error(f"Ollama embedding test failed: {e}")
             return False
 
+class AsyncBatcher:
+    """
+    Dynamic batching for concurrent single-text embedding requests.
+
+    Texts submitted within max_wait_ms of each other (up to max_batch) are embedded
+    together with one aencode() call, i.e. one /api/embed request.
+    """
+
+    def __init__(self, embedder: OllamaEmbeddings, max_batch: int = 32, max_wait_ms: float = 10):
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._task = None
+
+    async def submit(self, text: str) -> np.ndarray:
+        """Queue a text for the next batch and wait for its embedding"""
+        # The worker is started lazily because it needs a running event loop
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            # Keep collecting until the window closes or the batch is full
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                embeddings = await self.embedder.aencode([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            logger.debug(f"Embedded batch of {len(batch)} queued texts")
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+    async def close(self) -> None:
+        """Stop the background worker"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
 def get_ollama_embeddings(model_name: str = "bge-m3:latest") -> OllamaEmbeddings:
     """
     Factory function to create OllamaEmbeddings instance
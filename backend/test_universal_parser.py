@@ -0,0 +1,17 @@
+import pytest
+
+from universal_parser import UniversalResumeParser
+
+@pytest.fixture(scope="module")
+def parser() -> UniversalResumeParser:
+    return UniversalResumeParser()
+
+# A generic "City, Word" match overlapping a more specific one must not hide it
+@pytest.mark.parametrize("text, expected", [
+    ("Sunnybank, Brisbane, QLD", "Brisbane, QLD"),
+    ("Parramatta, Sydney, NSW", "Sydney, NSW"),
+    ("Richmond, Melbourne, Victoria", "Melbourne, Victoria"),
+    ("Kelvin Grove, Brisbane, Queensland", "Brisbane, Queensland"),
+])
+def test_extract_location_prefers_specific_overlapping_match(parser, text, expected):
+    assert parser.extract_location(text) == expected
@@ -1,13 +1,133 @@
 import os
-import json
-import chromadb
+
+# CPU threads for the embedder (EMBEDDING_THREADS to override). OpenMP/MKL read their
+# settings when torch is first imported, so these have to be in place before that.
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", os.cpu_count() or 4))
+os.environ.setdefault("OMP_NUM_THREADS", str(EMBEDDING_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(EMBEDDING_THREADS))
+
+import re
+import orjson
+import numpy as np
+import torch
+from bisect import bisect_left
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer
+from db import get_client, get_embedding_collection, mark_collection_updated, COLLECTION_NAME
+from embedding_cache import EmbeddingCache, cache_key
 from universal_parser import UniversalResumeParser
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+torch.set_num_threads(EMBEDDING_THREADS)
+try:
+    # Only intra-op parallelism helps a single encoder forward pass
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # torch already ran parallel work in this process, keep its inter-op pool
+    pass
+
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+# int8 dynamically-quantized ONNX export published in the model repo (VNNI int8 kernels)
+ONNX_INT8_FILE = 'onnx/model_qint8_avx512_vnni.onnx'
+
+# Section headers and names the parser tends to mistake for skills
+_FALSE_POSITIVES = frozenset({
+    'EXPERIENCE', 'EDUCATION', 'PROJECTS', 'PERSONAL', 'CERTIFICATIONS',
+    'SKILLS', 'INTERESTS', 'WORK', 'McPhail', 'ACT', 'PWA', 'NFTs', 'SPAs'
+})
+
+# Company "names" containing these are section headers picked up by the parser
+_SKIP = ('experience', 'work', 'achievements')
+
+# Certification lines mention being certified or holding a certificate
+_CERT_RE = re.compile(r'certifi(?:ed|cate)', re.IGNORECASE)
+
+# Chunks per collection.add call, keeps each write well under Chroma's max batch size
+ADD_BATCH_SIZE = 5000
+
+# (label, key) pairs for the personal information chunk, in display order
+_PERSONAL_FIELDS = (('Name', 'name'), ('Email', 'email'), ('Phone', 'phone'), ('Location', 'location'))
+
+@lru_cache(maxsize=1)
+def load_embedding_model():
+    """
+    Load the ingest embedding model once per process
+
+    On a CUDA machine this is the PyTorch model in fp16 on the GPU, otherwise the
+    int8 ONNX export on CPU. Set EMBEDDING_BACKEND=torch/onnx to force either one.
+    Falls back to PyTorch if onnxruntime/optimum aren't installed.
+    """
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    if os.getenv("EMBEDDING_BACKEND", "torch" if device == 'cuda' else "onnx") == "onnx":
+        try:
+            model = SentenceTransformer(EMBEDDING_MODEL, backend="onnx", model_kwargs={"file_name": ONNX_INT8_FILE})
+            # Embedding cache namespace, vectors from different backends/precisions must not mix
+            model.cache_namespace = f"{EMBEDDING_MODEL}:onnx-int8"
+            return model.eval()
+        except Exception as e:
+            logger.warning(f"ONNX embedding backend unavailable ({e}), using PyTorch")
+
+    model = SentenceTransformer(EMBEDDING_MODEL, device=device).eval()
+
+    # Half-precision weights: fp16 on GPU, bf16 on CPU (EMBEDDING_DTYPE=float32 to opt out)
+    dtype_name = os.getenv("EMBEDDING_DTYPE", "float16" if device == 'cuda' else "bfloat16")
+    if dtype_name != "float32":
+        model[0].auto_model = model[0].auto_model.to(getattr(torch, dtype_name))
+        _upcast_pooling(model)
+    model.cache_namespace = f"{EMBEDDING_MODEL}:torch-{dtype_name}"
+
+    return model
+
+def _upcast_pooling(model):
+    """Run mean pooling in fp32 so low-precision token embeddings don't lose accuracy in the reduction"""
+    pooling = model[1]
+    pooling_forward = pooling.forward
+
+    def forward(features):
+        features['token_embeddings'] = features['token_embeddings'].float()
+        return pooling_forward(features)
+
+    pooling.forward = forward
+
+def _encode_into(model, documents, indices, out, batch_size=32):
+    """
+    Encode documents[i] for each i in indices into out[i]
+
+    All texts are tokenized in a single fast-tokenizer call up front, then run through
+    the transformer in token-length-sorted batches trimmed to their longest row, so each
+    batch pads to similar sizes. Mean pooling and L2 normalization happen in fp32,
+    matching the model's own Pooling + Normalize modules. Vectors stay on the model's
+    device until every batch is done and are copied back to the host once.
+    """
+    enc = model.tokenizer(
+        [documents[i] for i in indices],
+        padding=True,
+        truncation=True,
+        max_length=model.max_seq_length,
+        return_tensors='pt'
+    )
+    lengths = enc['attention_mask'].sum(dim=1)
+    order = torch.argsort(lengths, stable=True)
+    transformer = model[0].auto_model
+    batches = []
+
+    with torch.inference_mode():
+        for start in range(0, len(indices), batch_size):
+            rows = order[start:start + batch_size]
+            width = int(lengths[rows].max())
+            batch = {name: tensor[rows, :width].to(model.device) for name, tensor in enc.items()}
+
+            token_embeddings = transformer(**batch).last_hidden_state.float()
+            mask = batch['attention_mask'].unsqueeze(-1).to(token_embeddings.dtype)
+            pooled = (token_embeddings * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            batches.append(torch.nn.functional.normalize(pooled, p=2, dim=1))
+
+        out[[indices[j] for j in order.tolist()]] = torch.cat(batches).cpu().numpy()
+
 def create_universal_chunks(parsed_data):
     """Convert universal parser data into optimized chunks for RAG"""
     chunks = []
@@ -17,182 +137,180 @@ def create_universal_chunks(parsed_data):
 
     # 1. Personal Information Chunk
     if personal.get('name'):
-        personal_info = []
-        if personal.get('name'):
-            personal_info.append(f"Name: {personal['name']}")
-        if personal.get('email'):
-            personal_info.append(f"Email: {personal['email']}")
-        if personal.get('phone'):
-            personal_info.append(f"Phone: {personal['phone']}")
-        if personal.get('location'):
-            personal_info.append(f"Location: {personal['location']}")
-
-        personal_chunk = {
-            'text': f"Personal Information:\n" + "\n".join(personal_info) + f"\n\n{name} is available for contact via the above information.",
+        personal_info = [f"{label}: {personal[key]}" for label, key in _PERSONAL_FIELDS if personal.get(key)]
+        chunks.append({
+            'text': "\n".join([
+                "Personal Information:",
+                *personal_info,
+                "",
+                f"{name} is available for contact via the above information."
+            ]),
             'metadata': {'section': 'personal', 'type': 'contact_info', 'person': name}
-        }
-        chunks.append(personal_chunk)
+        })
 
     # 2. Company Experience Chunks (one per company with details)
     companies = parsed_data.get('experience', {}).get('companies', [])
-    for company_data in companies:
-        if isinstance(company_data, dict):
-            company_name = company_data.get('name', '').strip()
-            position = company_data.get('position', 'Software Professional')
-            dates = company_data.get('dates', 'Date not specified')
-
-            # Clean company name from extra text
-            if '\n' in company_name:
-                company_name = company_name.split('\n')[-1].strip()
-
-            if company_name and not any(skip in company_name.lower() for skip in ['experience', 'work', 'achievements']):
-                # Create detailed work experience text with dates
-                experience_text = f"Work Experience:\nCompany: {company_name}\nPosition: {position}\nDates: {dates}\nEmployee: {name}\n\n{name} worked at {company_name} as a {position}"
-                if dates != "Date not specified":
-                    experience_text += f" from {dates}"
-                experience_text += ", contributing to development projects, technical solutions, and software engineering tasks."
-
-                company_chunk = {
-                    'text': experience_text,
-                    'metadata': {
-                        'section': 'experience',
-                        'type': 'company',
-                        'company_name': company_name,
-                        'position': position,
-                        'dates': dates,
-                        'person': name
-                    }
+    for company in companies:
+        company_name = company.name.strip()
+        position = company.position
+        dates = company.dates
+
+        # Clean company name from extra text
+        if '\n' in company_name:
+            company_name = company_name.split('\n')[-1].strip()
+
+        lname = company_name.lower()
+        if company_name and not any(skip in lname for skip in _SKIP):
+            # Create detailed work experience text with dates
+            period = f" from {dates}" if dates != "Date not specified" else ""
+            experience_text = "\n".join([
+                "Work Experience:",
+                f"Company: {company_name}",
+                f"Position: {position}",
+                f"Dates: {dates}",
+                f"Employee: {name}",
+                "",
+                f"{name} worked at {company_name} as a {position}{period}, "
+                "contributing to development projects, technical solutions, and software engineering tasks."
+            ])
+
+            chunks.append({
+                'text': experience_text,
+                'metadata': {
+                    'section': 'experience',
+                    'type': 'company',
+                    'company_name': company_name,
+                    'position': position,
+                    'dates': dates,
+                    'person': name
                 }
-                chunks.append(company_chunk)
+            })
 
     # 3. Skills Chunk (filtered and organized)
     skills = parsed_data.get('skills', [])
     if skills:
-        # Filter out obvious false positives
-        filtered_skills = []
-        false_positives = [
-            'EXPERIENCE', 'EDUCATION', 'PROJECTS', 'PERSONAL', 'CERTIFICATIONS',
-            'SKILLS', 'INTERESTS', 'WORK', 'McPhail', 'ACT', 'PWA', 'NFTs', 'SPAs'
+        # Filter out obvious false positives, allowing short acronyms
+        filtered_skills = [
+            skill for skill in skills
+            if len(skill) > 1 and skill not in _FALSE_POSITIVES and (not skill.isupper() or len(skill) <= 4)
         ]
 
-        for skill in skills:
-            if (len(skill) > 1 and
-                skill not in false_positives and
-                not skill.isupper() or len(skill) <= 4):  # Allow short acronyms
-                filtered_skills.append(skill)
-
         if filtered_skills:
             # Group by category for better organization
             skills_text = f"Technical Skills and Expertise:\n{name} is proficient in: {', '.join(filtered_skills[:15])}"  # Limit to top 15
             if len(filtered_skills) > 15:
                 skills_text += f" and {len(filtered_skills) - 15} other technologies."
 
-            skills_chunk = {
+            chunks.append({
                 'text': skills_text,
                 'metadata': {'section': 'skills', 'type': 'technical_skills', 'person': name}
-            }
-            chunks.append(skills_chunk)
+            })
 
     # 4. Education Chunks
     education = parsed_data.get('education', [])
     for edu in education:
-        if isinstance(edu, dict):
-            edu_parts = []
-            if edu.get('degree'):
-                edu_parts.append(f"Degree: {edu['degree']}")
-
-            if edu.get('institution'):
-                # Clean institution name
-                institution = edu['institution']
-                if '\n' in institution:
-                    # Take the cleanest part
-                    institution_parts = institution.split('\n')
-                    for part in institution_parts:
-                        if 'university' in part.lower() or 'college' in part.lower():
-                            institution = part.strip()
-                            break
-                    else:
-                        institution = institution_parts[-1].strip()
-                edu_parts.append(f"Institution: {institution}")
-
-            if edu.get('dates'):
-                edu_parts.append(f"Dates: {edu['dates']}")
-
-            if edu.get('location'):
-                edu_parts.append(f"Location: {edu['location']}")
-
-            if edu_parts:
-                education_text = f"Education Background:\n" + "\n".join(edu_parts) + f"\n\n{name} studied at {edu.get('institution', 'this institution')}"
-                if edu.get('dates'):
-                    education_text += f" from {edu['dates']}"
-                education_text += f" and earned a {edu.get('degree', 'degree')}."
-
-                education_chunk = {
-                    'text': education_text,
-                    'metadata': {
-                        'section': 'education',
-                        'type': 'academic',
-                        'institution': edu.get('institution', ''),
-                        'degree': edu.get('degree', ''),
-                        'dates': edu.get('dates', ''),
-                        'person': name
-                    }
+        degree = edu.degree
+        institution = edu.institution
+        dates = edu.dates
+        location = edu.location
+
+        edu_parts = []
+        if degree:
+            edu_parts.append(f"Degree: {degree}")
+
+        if institution:
+            # Clean institution name - take the cleanest part of a multi-line match
+            clean_institution = institution
+            if '\n' in institution:
+                institution_parts = institution.split('\n')
+                clean_institution = next(
+                    (part.strip() for part in institution_parts
+                     if 'university' in (lpart := part.lower()) or 'college' in lpart),
+                    institution_parts[-1].strip()
+                )
+            edu_parts.append(f"Institution: {clean_institution}")
+
+        if dates:
+            edu_parts.append(f"Dates: {dates}")
+
+        if location:
+            edu_parts.append(f"Location: {location}")
+
+        if edu_parts:
+            period = f" from {dates}" if dates else ""
+            education_text = "\n".join([
+                "Education Background:",
+                *edu_parts,
+                "",
+                f"{name} studied at {institution or 'this institution'}{period} and earned a {degree or 'degree'}."
+            ])
+
+            chunks.append({
+                'text': education_text,
+                'metadata': {
+                    'section': 'education',
+                    'type': 'academic',
+                    'institution': institution,
+                    'degree': degree,
+                    'dates': dates,
+                    'person': name
                 }
-                chunks.append(education_chunk)
+            })
 
     # 5. Certifications Chunk (filtered)
     certifications = parsed_data.get('certifications', [])
-    valid_certs = []
-    for cert in certifications:
-        # Filter out section headers and false positives
-        if (len(cert) > 10 and
-            not cert.isupper() and
-            'certified' in cert.lower() or 'certificate' in cert.lower()):
-            valid_certs.append(cert)
+    # Filter out section headers and false positives
+    valid_certs = [cert for cert in certifications if len(cert) > 10 and not cert.isupper() and _CERT_RE.search(cert)]
 
     if valid_certs:
-        cert_text = f"Certifications:\n{name} holds the following certifications:\n" + "\n".join([f"• {cert}" for cert in valid_certs])
-        cert_chunk = {
-            'text': cert_text,
+        chunks.append({
+            'text': "\n".join([
+                "Certifications:",
+                f"{name} holds the following certifications:",
+                *(f"• {cert}" for cert in valid_certs)
+            ]),
             'metadata': {'section': 'certifications', 'type': 'credentials', 'person': name}
-        }
-        chunks.append(cert_chunk)
+        })
 
     # 6. References Chunk
     references = parsed_data.get('references', [])
-    if references:
-        ref_parts = []
-        for ref in references:
-            if isinstance(ref, dict) and ref.get('name'):
-                ref_info = f"• {ref['name']}"
-                if ref.get('phone'):
-                    ref_info += f" - Phone: {ref['phone']}"
-                if ref.get('email'):
-                    ref_info += f" - Email: {ref['email']}"
-                ref_parts.append(ref_info)
-
-        if ref_parts:
-            ref_text = f"Professional References:\n{name} has provided the following professional references:\n" + "\n".join(ref_parts)
-            ref_chunk = {
-                'text': ref_text,
-                'metadata': {'section': 'references', 'type': 'contacts', 'person': name}
-            }
-            chunks.append(ref_chunk)
+    ref_parts = []
+    for ref in references:
+        if ref.name:
+            ref_info = f"• {ref.name}"
+            if ref.phone:
+                ref_info += f" - Phone: {ref.phone}"
+            if ref.email:
+                ref_info += f" - Email: {ref.email}"
+            ref_parts.append(ref_info)
+
+    if ref_parts:
+        chunks.append({
+            'text': "\n".join([
+                "Professional References:",
+                f"{name} has provided the following professional references:",
+                *ref_parts
+            ]),
+            'metadata': {'section': 'references', 'type': 'contacts', 'person': name}
+        })
 
     # 7. Interests Chunk
     interests = parsed_data.get('interests', [])
     if interests:
-        interests_text = f"Personal Interests:\n{name} enjoys: {', '.join(interests)}"
-        interests_chunk = {
-            'text': interests_text,
+        chunks.append({
+            'text': f"Personal Interests:\n{name} enjoys: {', '.join(interests)}",
             'metadata': {'section': 'interests', 'type': 'hobbies', 'person': name}
-        }
-        chunks.append(interests_chunk)
+        })
 
     return chunks
 
-def ingest_universal_resume(pdf_path: str, chroma_db_path: str = "./data/chroma_db"):
-    """Ingest resume using universal parser"""
+def ingest_universal_resume(pdf_path: str, chroma_db_path: str = "./data/chroma_db", write_debug: bool = False):
+    """
+    Ingest resume using universal parser
+
+    With write_debug=True the parsed resume is also saved to
+    {chroma_db_path}/universal_parsed_resume.json for inspection.
+    """
 
     # Parse resume with universal parser
     logger.info(f"Parsing resume with Universal Parser: {pdf_path}")
@@ -211,55 +329,77 @@ def ingest_universal_resume(pdf_path: str, chroma_db_path: str = "./data/chroma_
     logger.info(f"Created {len(chunks)} optimized chunks")
 
     # Display chunk summary
-    for i, chunk in enumerate(chunks):
-        section = chunk['metadata'].get('section', 'unknown')
-        chunk_type = chunk['metadata'].get('type', 'unknown')
-        preview = chunk['text'][:100].replace('\n', ' ')
-        logger.info(f"  Chunk {i+1}: {section}/{chunk_type} - {preview}...")
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, chunk in enumerate(chunks):
+            section = chunk['metadata'].get('section', 'unknown')
+            chunk_type = chunk['metadata'].get('type', 'unknown')
+            preview = chunk['text'][:100].replace('\n', ' ')
+            logger.debug(f"  Chunk {i+1}: {section}/{chunk_type} - {preview}...")
 
     # Initialize embedding model
     logger.info("Loading embedding model...")
-    embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+    embedding_model = load_embedding_model()
 
     # Initialize ChromaDB
-    os.makedirs(chroma_db_path, exist_ok=True)
-    chroma_client = chromadb.PersistentClient(path=chroma_db_path)
+    chroma_client = get_client(chroma_db_path)
 
-    # Create or reset collection
-    try:
-        collection = chroma_client.delete_collection("resume_knowledge")
-        logger.info("Deleted existing collection")
-    except:
-        pass
-
-    collection = chroma_client.create_collection("resume_knowledge")
-    logger.info("Created new collection")
+    # Reuse the collection (recreated if another embedding model filled it) and clear out the previous ingest
+    collection = get_embedding_collection(chroma_client, EMBEDDING_MODEL)
+    existing_ids = collection.get(include=[])['ids']
+    if existing_ids:
+        collection.delete(ids=existing_ids)
+        logger.info(f"Removed {len(existing_ids)} existing chunks")
 
     # Generate embeddings and store
     documents = [chunk['text'] for chunk in chunks]
     metadatas = [chunk['metadata'] for chunk in chunks]
     ids = [f"universal_chunk_{i}" for i in range(len(chunks))]
 
-    # Generate embeddings
-    logger.info("Generating embeddings...")
-    embeddings = embedding_model.encode(documents)
-
-    # Store in ChromaDB
-    collection.add(
-        embeddings=embeddings.tolist(),
-        documents=documents,
-        metadatas=metadatas,
-        ids=ids
-    )
+    # Reuse vectors for chunks whose text was already embedded in an earlier ingest
+    embedding_cache = EmbeddingCache(f"{chroma_db_path}/emb_cache.sqlite")
+    keys = [cache_key(embedding_model.cache_namespace, doc) for doc in documents]
+    cached = embedding_cache.get(keys)
+    misses = [i for i, key in enumerate(keys) if key not in cached]
+    logger.info(f"Embedding cache: {len(documents) - len(misses)} hits, {len(misses)} misses")
+
+    embeddings = np.empty((len(documents), embedding_model.get_sentence_embedding_dimension()), dtype=np.float32)
+    for i, key in enumerate(keys):
+        if key in cached:
+            embeddings[i] = cached[key]
+
+    # Generate embeddings window by window and store in ChromaDB. A single writer thread
+    # persists each finished window while the next one is being embedded, and keeps the
+    # Chroma writes serialized. Numpy embeddings go straight through without a list-of-floats copy.
+    if misses:
+        logger.info("Generating embeddings...")
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        writes = []
+        for start in range(0, len(ids), ADD_BATCH_SIZE):
+            end = start + ADD_BATCH_SIZE
+            window_misses = misses[bisect_left(misses, start):bisect_left(misses, end)]
+            if window_misses:
+                _encode_into(embedding_model, documents, window_misses, embeddings)
+            writes.append(writer.submit(
+                collection.add,
+                embeddings=embeddings[start:end],
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
+            ))
+        for write in writes:
+            write.result()
+    mark_collection_updated(chroma_db_path)
+    embedding_cache.put(list({keys[i]: embeddings[i] for i in misses}.items()))
 
     logger.info(f"Successfully ingested {len(chunks)} universal chunks into ChromaDB")
 
     # Save parsed data for debugging
-    debug_file = f"{chroma_db_path}/universal_parsed_resume.json"
-    with open(debug_file, 'w') as f:
-        json.dump(parsed_data, f, indent=2, default=str)
+    if write_debug:
+        debug_file = f"{chroma_db_path}/universal_parsed_resume.json"
+        with open(debug_file, 'wb') as f:
+            f.write(orjson.dumps(parsed_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY, default=str))
 
-    logger.info(f"Saved parsed resume data to: {debug_file}")
+        logger.info(f"Saved parsed resume data to: {debug_file}")
 
     return True
 
@@ -277,13 +417,13 @@ def main():
         print("✅ Universal resume ingestion completed successfully!")
 
         # Test retrieval with various queries
-        chroma_client = chromadb.PersistentClient(path="./data/chroma_db")
-        collection = chroma_client.get_collection("resume_knowledge")
+        chroma_client = get_client("./data/chroma_db")
+        collection = chroma_client.get_collection(COLLECTION_NAME)
 
         print(f"\n📊 Collection stats: {collection.count()} documents")
 
         # Test queries
-        embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        embedding_model = load_embedding_model()
 
         test_queries = [
             "What companies has Nirwan worked for?",
@@ -292,16 +432,24 @@ def main():
             "Tell me about Nirwan's education background"
         ]
 
-        for query in test_queries:
-            print(f"\n🔍 Test query: '{query}'")
-            query_embedding = embedding_model.encode([query])
-
-            results = collection.query(
-                query_embeddings=query_embedding.tolist(),
-                n_results=2
+        # Embed all test queries in a single forward pass, then search them in one query call
+        with torch.inference_mode():
+            query_embeddings = embedding_model.encode(
+                test_queries,
+                batch_size=len(test_queries),
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False
             )
+        results = collection.query(
+            query_embeddings=query_embeddings,
+            n_results=2
+        )
+
+        for query, documents, metadatas in zip(test_queries, results['documents'], results['metadatas']):
+            print(f"\n🔍 Test query: '{query}'")
 
-            for i, (doc, meta) in enumerate(zip(results['documents'][0], results['metadatas'][0])):
+            for i, (doc, meta) in enumerate(zip(documents, metadatas)):
                 section = meta.get('section', 'unknown')
                 chunk_type = meta.get('type', 'unknown')
                 preview = doc[:150].replace('\n', ' ')
@@ -1,37 +1,353 @@
+import os
 import re
 import json
+try:
+    # Optional: RE2 matches in linear time (no backtracking blowups), falls back to re
+    import re2
+except ImportError:
+    re2 = None
+try:
+    # Optional: finds every known skill in a single pass over the text
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+try:
+    # Optional: matches all skill patterns at once with SIMD, preferred over ahocorasick
+    import hyperscan
+except ImportError:
+    hyperscan = None
+try:
+    # Optional: PDFium text extraction is much faster than pdfminer's Python layout engine
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
 import spacy
-from pdfminer.high_level import extract_text
-from typing import Dict, List, Any, Optional
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LTChar, LTContainer, LTPage
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from io import StringIO
+from typing import Dict, List, Any, Optional, Iterator, Callable, Set, Tuple
+from dataclasses import dataclass, asdict, is_dataclass
 import logging
-from collections import Counter
+from collections import Counter, OrderedDict, deque
+from functools import wraps
+from itertools import islice
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'))
+
+def _compile(pattern: str, flags: int = 0) -> Any:
+    """Compile a pattern with RE2 when it's installed, otherwise with re"""
+    if re2 is not None:
+        inline = ''.join(flag for bit, flag in _INLINE_FLAGS if flags & bit)
+        try:
+            return re2.compile(f'(?{inline}){pattern}' if inline else pattern)
+        except re2.error:
+            logger.debug(f"Pattern not supported by RE2, using re: {pattern}")
+    return re.compile(pattern, flags)
+
+def _keywords_re(keywords: List[str]) -> Any:
+    """One pattern that finds any of the literal keywords"""
+    return _compile('|'.join(map(re.escape, keywords)))
+
+# Every line of a text, empty ones included, same as text.split('\n').
+# Always re: RE2 yields extra empty matches between lines.
+LINE_RE = re.compile(r'^.*$', re.MULTILINE)
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Lines of text one at a time, without building the whole list"""
+    for match in LINE_RE.finditer(text):
+        yield match.group()
+
+def _line_windows(text: str, before: int, after: int) -> Iterator[Tuple[str, Iterator[str]]]:
+    """
+    Each line with an iterator over the lines around it (before..line..after)
+
+    Only before + 1 + after lines are held at a time; the iterator has to be
+    consumed before asking for the next line.
+    """
+    window: deque = deque(maxlen=before + 1 + after)
+    read = 0  # lines read so far
+    current = 0  # next line to yield
+    for line in _iter_lines(text):
+        window.append(line)
+        read += 1
+        if read - current > after:
+            start = read - len(window)
+            lo = max(0, current - before)
+            yield window[current - start], islice(window, lo - start, None)
+            current += 1
+    start = read - len(window)
+    while current < read:
+        lo = max(0, current - before)
+        yield window[current - start], islice(window, lo - start, None)
+        current += 1
+
+# Patterns used by the extractors, compiled once at import.
+# Lookahead patterns aren't supported by RE2 and always use re. So do patterns
+# with \b or \w: RE2 treats only ASCII as word characters, re all Unicode letters.
+_EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+EMAIL_RE = re.compile(_EMAIL_PATTERN, re.IGNORECASE)
+NON_PHONE_CHARS_RE = _compile(r'[^\d+]')
+NON_WORD_RE = re.compile(r'[^\w\s]')
+
+REFERENCE_INDICATOR_PATTERNS = [
+    _compile(r'(?i)(dr\.|prof\.|mr\.|ms\.|mrs\.)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)'),
+    _compile(r'(?i)(manager|supervisor|director|lead|head)\s*:?\s*([A-Z][a-z]+\s+[A-Z][a-z]+)'),
+    _compile(r'(?i)contact\s*:?\s*[^\n]*?([A-Z][a-z]+\s+[A-Z][a-z]+)'),
+]
+
+INTERESTS_HEADING_RE = re.compile(r'(?i)\binterests?\b\s*\n')
+# An all-caps line of more than 10 characters, i.e. the heading after the interests section
+NEXT_HEADING_RE = _compile(r'^[^\S\n]*[A-Z][A-Z &/,-]{9,}[A-Z][^\S\n]*$', re.MULTILINE)
+
+JOB_TITLE_SPLIT_RE = _compile(r'(?i)(programmer analyst|software engineer|developer|engineer)')
+# MM/YYYY - MM/YYYY or MM/YYYY - Present
+JOB_DATES_RE = _compile(r'(\d{1,2}/\d{4}\s*-\s*(?:\d{1,2}/\d{4}|Present))')
+
+SKILLS_SECTION_PATTERNS = [
+    re.compile(r'(?i)(technical\s+skills?|skills?|technologies)\s*:?\s*(.*?)(?=\n\s*[A-Z]{2,}|\n\s*$|$)', re.DOTALL | re.MULTILINE),
+    re.compile(r'(?i)technologies\s*:?\s*(.*?)(?=\n\s*[A-Z]{2,}|\n\s*$|$)', re.DOTALL | re.MULTILINE),
+]
+
+# Known technical skills (curated list)
+TECHNICAL_SKILLS = {
+    'Python', 'JavaScript', 'TypeScript', 'Java', 'C#', 'C++', 'Go', 'Rust',
+    'PHP', 'Ruby', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB',
+    'React', 'Angular', 'Vue', 'Svelte', 'Node.js', 'Express', 'Django',
+    'Flask', 'Spring', 'Laravel', 'Ruby on Rails', 'ASP.NET',
+    'AWS', 'Lambda', 'EC2', 'S3', 'DynamoDB', 'CloudFormation', 'CloudWatch',
+    'API Gateway', 'Elastic Beanstalk', 'RDS', 'VPC', 'IAM', 'CodePipeline',
+    'CodeDeploy', 'SES', 'Azure', 'GCP', 'Google Cloud', 'Kubernetes', 'Docker',
+    'Terraform', 'Ansible', 'Jenkins', 'GitLab CI', 'GitHub Actions',
+    'MongoDB', 'PostgreSQL', 'MySQL', 'SQLite', 'Redis', 'Elasticsearch',
+    'Oracle', 'SQL Server', 'Cassandra', 'Neo4j', 'DynamoDB',
+    'Git', 'GitHub', 'GitLab', 'Jira', 'Confluence', 'Linux', 'HTML', 'CSS',
+    'GraphQL', 'REST', 'API', 'APIs', 'JSON', 'XML', 'YAML'
+}
+# Whole-word match for each skill against lowercased text (used without pyahocorasick).
+# Always re, not _compile: RE2's \b would split words at non-ASCII letters.
+SKILL_PATTERNS = {skill: re.compile(rf'\b{re.escape(skill.lower())}\b') for skill in TECHNICAL_SKILLS}
+
+def _build_skill_automaton() -> Any:
+    """Aho-Corasick automaton over the lowercased skills, payload is (skill, key length)"""
+    automaton = ahocorasick.Automaton()
+    for skill in TECHNICAL_SKILLS:
+        key = skill.lower()
+        automaton.add_word(key, (skill, len(key)))
+    automaton.make_automaton()
+    return automaton
+
+SKILL_AUTOMATON = _build_skill_automaton() if ahocorasick is not None else None
+
+# Hyperscan only supports ASCII \\b. For skills that start and end with a letter
+# or digit that only over-matches next to non-ASCII bytes, which _hyperscan_skills
+# re-checks with re; skills like C# or C++ are always matched with re.
+# Hyperscan pattern ids index SKILL_LIST.
+SKILL_LIST = sorted(skill for skill in TECHNICAL_SKILLS if skill[0].isalnum() and skill[-1].isalnum())
+_REGEX_ONLY_SKILLS = sorted(TECHNICAL_SKILLS.difference(SKILL_LIST))
+
+def _build_skill_database() -> Any:
+    """Hyperscan database with the SKILL_PATTERNS expressions, each reported once per scan"""
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[rf'\b{re.escape(skill.lower())}\b'.encode() for skill in SKILL_LIST],
+        ids=list(range(len(SKILL_LIST))),
+        elements=len(SKILL_LIST),
+        flags=hyperscan.HS_FLAG_SINGLEMATCH,
+    )
+    return database
+
+# The database owns a single scratch space, so scans must not run concurrently
+SKILL_DATABASE = _build_skill_database() if hyperscan is not None else None
+
+def _hyperscan_skills(search_text: str) -> Set[str]:
+    """Skills in the lowercased text, found by one SKILL_DATABASE scan"""
+    data = search_text.encode('utf-8', 'replace')
+    found: Set[str] = set()
+
+    def on_match(skill_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        skill = SKILL_LIST[skill_id]
+        # Skills are literals, so the match starts len(skill) bytes before its end
+        start = end - len(skill.lower().encode())
+        if (start > 0 and data[start - 1] >= 0x80) or (end < len(data) and data[end] >= 0x80):
+            # Unicode letters are word characters for re but not for Hyperscan
+            if not SKILL_PATTERNS[skill].search(search_text):
+                return
+        found.add(skill)
+
+    assert SKILL_DATABASE is not None
+    SKILL_DATABASE.scan(data, match_event_handler=on_match)
+    found.update(skill for skill in _REGEX_ONLY_SKILLS if SKILL_PATTERNS[skill].search(search_text))
+    return found
+
+def _at_word_boundary(text: str, pos: int) -> bool:
+    """Same test as regex \\b: exactly one side of pos is a word character"""
+    before = pos > 0 and (text[pos - 1].isalnum() or text[pos - 1] == '_')
+    after = pos < len(text) and (text[pos].isalnum() or text[pos] == '_')
+    return before != after
+
+EDUCATION_SECTION_RE = re.compile(r'(?i)education\s*(.*?)(?=\n\s*[A-Z]{2,}|\n\s*$|$)', re.DOTALL)
+EDUCATION_DEGREE_PATTERNS = [
+    _compile(r'(?i)bachelor\s+of\s+([A-Za-z\s]+)'),
+    _compile(r'(?i)master\s+of\s+([A-Za-z\s]+)'),
+    _compile(r'(?i)(bachelor|master|phd|doctorate)\s+([A-Za-z\s]+)'),
+    _compile(r'(?i)(b\.?\s*[a-z]+|m\.?\s*[a-z]+|phd|ph\.?d\.?)'),
+]
+EDUCATION_DATES_RE = _compile(r'(\d{1,2}/\d{4}\s*-\s*\d{1,2}/\d{4})')
+EDUCATION_LOCATION_PATTERNS = [
+    _compile(r'([A-Z][a-z]+,\s*[A-Z]{2,3})'),  # City, State/Country
+    _compile(r'([A-Z][a-z]+,\s*[A-Z][a-z]+)'),  # City, Country
+]
+
+# International location patterns, one capture group each
+_LOCATION_PATTERNS = [
+    # City, State/Province (full names)
+    r'([A-Z][a-z]+,\s*Queensland)',
+    r'([A-Z][a-z]+,\s*New South Wales)',
+    r'([A-Z][a-z]+,\s*Victoria)',
+    r'([A-Z][a-z]+,\s*California)',
+    r'([A-Z][a-z]+,\s*New York)',
+    # City, State/Province abbreviations
+    r'([A-Z][a-z]+,\s*QLD)',
+    r'([A-Z][a-z]+,\s*NSW)',
+    r'([A-Z][a-z]+,\s*VIC)',
+    r'([A-Z][a-z]+,\s*ACT)',
+    # Generic patterns (but we'll filter these)
+    r'([A-Z][a-z]+,\s*[A-Z][a-z]+)',
+]
+
+@dataclass(slots=True, frozen=True)
+class Company:
+    """A work experience entry found by the parser"""
+    name: str
+    position: str = "Software Professional"
+    dates: str = "Date not specified"
+    confidence: int = 10
+
+@dataclass(slots=True, frozen=True)
+class Education:
+    """An education entry, empty strings for fields that weren't found"""
+    degree: str = ""
+    institution: str = ""
+    dates: str = ""
+    location: str = ""
+
+@dataclass(slots=True, frozen=True)
+class Reference:
+    """A referee with at least one way to contact them"""
+    name: str
+    email: str = ""
+    phone: str = ""
+
+class _LineTextConverter(TextConverter):
+    """
+    pdfminer text output without layout analysis
+
+    Characters are written in content-stream order; a new line starts when the
+    baseline moves or the text jumps back left, and a space is added at gaps
+    wider than pdfminer's default word margin.
+    """
+    WORD_MARGIN = 0.1
+
+    def receive_layout(self, ltpage: LTPage) -> None:
+        prev: Optional[LTChar] = None
+
+        def render(item: Any) -> None:
+            nonlocal prev
+            if isinstance(item, LTContainer):
+                for child in item:
+                    render(child)
+            elif isinstance(item, LTChar):
+                if prev is not None:
+                    if abs(item.y0 - prev.y0) > min(item.height, prev.height) / 2 or item.x1 <= prev.x0:
+                        self.write_text('\n')
+                    elif (item.x0 - prev.x1 > self.WORD_MARGIN * max(prev.width, prev.height)
+                          and not item.get_text().isspace() and not prev.get_text().isspace()):
+                        self.write_text(' ')
+                self.write_text(item.get_text())
+                prev = item
+
+        render(ltpage)
+        self.write_text('\n')
+
+# Number of recent texts whose extractor results are kept per parser
+EXTRACTOR_CACHE_SIZE = 8
+
+def _cached_extractor(method: Callable) -> Callable:
+    """
+    Memoize an extractor per text
+
+    The extra arguments are only precomputed hints (contacts, text_lower) that must
+    not change the result, which is why the cache is keyed on the text alone.
+    """
+    @wraps(method)
+    def wrapper(self: 'UniversalResumeParser', text: str, *args: Any, **kwargs: Any) -> Any:
+        results = self._extractor_results(text)
+        if method.__name__ not in results:
+            results[method.__name__] = method(self, text, *args, **kwargs)
+        result = results[method.__name__]
+        # Callers get their own list so they can't modify the cached one
+        # (the dataclasses in it are frozen)
+        return list(result) if isinstance(result, list) else result
+    return wrapper
+
 class UniversalResumeParser:
-    def __init__(self):
+    def __init__(self) -> None:
         """Initialize the universal resume parser"""
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-            logger.info("spaCy model loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load spaCy model: {e}")
-            self.nlp = None
+        # spaCy is only needed when the name heuristics fail, see the nlp property
+        self._nlp: Optional[Any] = None
+        self._nlp_loaded = False
+        # Extractor results for the most recent texts, see _cached_extractor
+        self._extractor_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
 
         # Universal patterns
         self.setup_patterns()
 
-    def setup_patterns(self):
+    def _extractor_results(self, text: str) -> Dict[str, Any]:
+        """Cached extractor results for text, by method name"""
+        results = self._extractor_cache.get(text)
+        if results is None:
+            results = self._extractor_cache[text] = {}
+            if len(self._extractor_cache) > EXTRACTOR_CACHE_SIZE:
+                self._extractor_cache.popitem(last=False)
+        else:
+            self._extractor_cache.move_to_end(text)
+        return results
+
+    @property
+    def nlp(self) -> Optional[Any]:
+        """spaCy pipeline, loaded on first use (None if it can't be loaded)"""
+        if not self._nlp_loaded:
+            self._nlp_loaded = True
+            try:
+                # Only NER is used (extract_name), skip the rest of the pipeline
+                self._nlp = spacy.load('en_core_web_sm', disable=['tagger', 'parser', 'attribute_ruler', 'lemmatizer'])
+                logger.info("spaCy model loaded successfully")
+            except Exception as e:
+                logger.error(f"Failed to load spaCy model: {e}")
+        return self._nlp
+
+    def setup_patterns(self) -> None:
         """Setup universal patterns for different resume formats"""
 
         # Company suffixes (international)
-        self.company_suffixes = [
+        legal_suffixes = [
             r'Pty Ltd', r'Ltd', r'Inc', r'LLC', r'Corp', r'Corporation',
             r'GmbH', r'AG', r'SA', r'S\.A\.', r'BV', r'AB', r'AS',
-            r'Co\.', r'Company', r'Group', r'Holdings', r'Ventures',
+            r'Co\.', r'Company'
+        ]
+        self.company_suffixes = legal_suffixes + [
+            r'Group', r'Holdings', r'Ventures',
             r'Technologies', r'Systems', r'Solutions', r'Services'
         ]
+        # Any suffix as a plain substring, used to spot company lines
+        self.company_suffix_any_re = _keywords_re(self.company_suffixes)
+        # Trailing legal-form suffixes, stripped from names when deduplicating companies
+        self.legal_suffix_tail_re = re.compile(r'(?:\W*(?<!\w)(?:' + '|'.join(legal_suffixes) + r')(?!\w))+\W*$')
 
         # Education keywords
         self.education_keywords = [
@@ -40,7 +356,7 @@ class UniversalResumeParser:
         ]
 
         # Degree patterns
-        self.degree_patterns = [
+        degree_patterns = [
             r'Bachelor(?:\'s)?(?:\s+of\s+|\s+in\s+|\s+)([A-Z][^,\n.]+)',
             r'Master(?:\'s)?(?:\s+of\s+|\s+in\s+|\s+)([A-Z][^,\n.]+)',
             r'PhD(?:\s+in\s+|\s+)([A-Z][^,\n.]+)',
@@ -51,9 +367,10 @@ class UniversalResumeParser:
             r'B\.?[A-Z]\.?(?:\s+|$)',  # BA, BS, etc.
             r'M\.?[A-Z]\.?(?:\s+|$)',  # MA, MS, etc.
         ]
+        self.degree_patterns = [_compile(p, re.IGNORECASE) for p in degree_patterns]
 
         # Phone patterns (international) - improved
-        self.phone_patterns = [
+        phone_patterns = [
             # Australian full format
             r'\+61[0-9]{9}',  # +61481948203
             r'\+61[-.\s][0-9][-.\s]?[0-9]{4}[-.\s]?[0-9]{4}',  # +61 4 8194 8203
@@ -67,49 +384,200 @@ class UniversalResumeParser:
             r'\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
             r'[0-9]{2,4}[-.\s][0-9]{3,4}[-.\s][0-9]{4,8}'
         ]
+        self.phone_patterns = [_compile(p) for p in phone_patterns]
+
+        # Keyword lists used for scoring, each searched as a single alternation
+        # Lines with common resume keywords aren't names
+        self.name_skip_re = _keywords_re([
+            'software', 'engineer', 'developer', 'manager', 'analyst',
+            'certified', 'phone', 'email', '@', 'resume', 'cv',
+            'experience', 'years', 'skills', 'objective', 'summary'
+        ])
+        # Common personal email patterns
+        self.personal_email_re = _keywords_re([
+            'gmail', 'yahoo', 'hotmail', 'outlook', 'icloud',
+            'protonmail', 'me.com', 'live.com'
+        ])
+        # Obvious reference emails
+        self.reference_email_re = _keywords_re([
+            'noreply', 'admin', 'info', 'contact', 'support', 'help',
+            'hr@', 'jobs@', 'careers@', 'team@'
+        ])
+        # Business domain patterns that might be references
+        self.business_email_re = _keywords_re(['benmcphail', 'company', 'corp', 'ltd'])
+        # Reference keywords near an email
+        self.reference_context_re = _keywords_re(['contact', 'reference', 'manager', 'supervisor'])
+        # Reference indicators near a phone
+        self.reference_phone_re = _keywords_re([
+            'contact:', 'reference:', 'manager:', 'supervisor:',
+            'dr.', 'prof.', 'mr.', 'ms.', 'mrs.',
+            'ben mcphail', 'christopher read'
+        ])
+        # Personal phone indicators
+        self.personal_phone_re = _keywords_re(['mobile:', 'cell:', 'phone:', 'tel:'])
+        # Real locations
+        self.real_location_re = _keywords_re([
+            'brisbane', 'sydney', 'melbourne', 'perth', 'adelaide', 'canberra',
+            'queensland', 'new south wales', 'victoria', 'qld', 'nsw', 'vic', 'act',
+            'new york', 'california', 'london', 'toronto', 'vancouver'
+        ])
+        # "City, Word" matches that are really tech terms
+        self.false_location_re = _keywords_re([
+            'lambda', 'ec2', 'api', 'react', 'python', 'node', 'gateway',
+            'deploy', 'code', 'script', 'elastic'
+        ])
+        # Personal info keywords near a location
+        self.personal_context_re = _keywords_re(['email', 'phone', 'address', 'australia'])
+
+        # Emails and phones in one alternation, the group name tells them apart
+        # (re, for the email pattern's \b)
+        contact_patterns = [
+            f"(?P<email>{_EMAIL_PATTERN})",
+            "(?P<phone>" + "|".join(f"(?:{p})" for p in phone_patterns) + ")",
+        ]
+        self.contact_re = re.compile("|".join(contact_patterns))
+        # Locations are scanned pattern by pattern instead: in the alternation a generic
+        # "City, Word" match consumed the start of an overlapping, more specific one
+        # ("Sunnybank, Brisbane" hid "Brisbane, QLD")
+        self.location_res = [_compile(p) for p in _LOCATION_PATTERNS]
 
     def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract text from PDF using pdfminer"""
+        """Extract text from PDF using PDFium when available, otherwise pdfminer"""
+        if pdfium is not None:
+            try:
+                text = '\n'.join(self._iter_pages_pdfium(pdf_path))
+                logger.info(f"Extracted {len(text)} characters from PDF")
+                return text
+            except Exception as e:
+                logger.warning(f"PDFium extraction failed, falling back to pdfminer: {e}")
+
         try:
-            text = extract_text(pdf_path)
+            text = '\n'.join(self._iter_pages_pdfminer(pdf_path))
             logger.info(f"Extracted {len(text)} characters from PDF")
             return text
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             return ""
 
+    @staticmethod
+    def _iter_pages_pdfium(pdf_path: str) -> Iterator[str]:
+        """Page texts via PDFium, one page after another"""
+        # PDFium isn't thread-safe, so pages are read sequentially rather than on a pool
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for page in pdf:
+                textpage = page.get_textpage()
+                text = textpage.get_text_range().replace('\r\n', '\n')
+                textpage.close()
+                page.close()
+                yield text
+        finally:
+            pdf.close()
+
+    @staticmethod
+    def _iter_pages_pdfminer(pdf_path: str) -> Iterator[str]:
+        """Page texts via pdfminer, the converter's buffer is emptied after every page"""
+        with open(pdf_path, 'rb') as fp, StringIO() as output:
+            rsrcmgr = PDFResourceManager()
+            # Layout analysis is pdfminer's slowest stage and only line breaks are needed
+            device = _LineTextConverter(rsrcmgr, output)
+            interpreter = PDFPageInterpreter(rsrcmgr, device)
+            for page in PDFPage.get_pages(fp):
+                interpreter.process_page(page)
+                text = output.getvalue()
+                output.seek(0)
+                output.truncate()
+                yield text
+
+    @_cached_extractor
     def extract_name(self, text: str) -> str:
         """Extract name using multiple heuristics"""
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines = self._head_lines(text)
 
         # Strategy 1: First meaningful line
+        name = self._name_from_lines(lines)
+        if name:
+            return name
+
+        # Strategy 2: Use spaCy NER if available
+        if self.nlp:
+            return self._name_from_doc(self.nlp(self._name_candidate(lines)))
+
+        return ""
+
+    @staticmethod
+    def _head_lines(text: str, count: int = 10) -> List[str]:
+        """The first non-empty lines, stripped (all the name heuristics look at)"""
+        lines: List[str] = []
+        for line in _iter_lines(text):
+            line = line.strip()
+            if line:
+                lines.append(line)
+                if len(lines) == count:
+                    break
+        return lines
+
+    def _name_from_lines(self, lines: List[str]) -> str:
+        """Heuristic name: the first short, capitalized line without resume keywords"""
         for line in lines[:10]:
             # Skip lines with common resume keywords
-            skip_keywords = [
-                'software', 'engineer', 'developer', 'manager', 'analyst',
-                'certified', 'phone', 'email', '@', 'resume', 'cv',
-                'experience', 'years', 'skills', 'objective', 'summary'
-            ]
-
-            if not any(keyword in line.lower() for keyword in skip_keywords):
+            if not self.name_skip_re.search(line.lower()):
                 # Check if it looks like a name (2-4 words, proper capitalization)
                 words = line.split()
                 if 2 <= len(words) <= 4 and all(word[0].isupper() for word in words if word.isalpha()):
                     return ' '.join(words)
+        return ""
 
-        # Strategy 2: Use spaCy NER if available
-        if self.nlp:
-            doc = self.nlp(' '.join(lines[:5]))  # Check first 5 lines
-            for ent in doc.ents:
-                if ent.label_ == 'PERSON' and len(ent.text.split()) >= 2:
-                    return ent.text
-
+    @staticmethod
+    def _name_candidate(lines: List[str]) -> str:
+        """Text handed to NER when the heuristic finds no name"""
+        return ' '.join(lines[:5])[:500]  # Check first 5 lines
+
+    @staticmethod
+    def _name_from_doc(doc: Any) -> str:
+        """First multi-word PERSON entity in a spaCy doc"""
+        for ent in doc.ents:
+            if ent.label_ == 'PERSON' and len(ent.text.split()) >= 2:
+                return ent.text
         return ""
 
-    def extract_email(self, text: str) -> str:
-        """Extract primary email address intelligently"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text, re.IGNORECASE)
+    def _scan_contacts(self, text: str) -> Dict[str, List[tuple]]:
+        """
+        Find every email, phone and location in the text
+
+        Emails and phones are (start, text) pairs found in a single pass; locations are
+        (start, text, pattern) where pattern is the 1-based index of the location pattern
+        that matched, listed pattern by pattern.
+        """
+        contacts: Dict[str, List[tuple]] = {'email': [], 'phone': [], 'location': []}
+
+        for i, location_re in enumerate(self.location_res, 1):
+            contacts['location'].extend((match.start(), match.group(0), i) for match in location_re.finditer(text))
+
+        pos = 0
+        while match := self.contact_re.search(text, pos):
+            kind = match.lastgroup
+            start = match.start()
+            pos = match.end()
+            if kind == 'phone':
+                # A phone that's too short is retried one character later,
+                # since another pattern may match a longer number there
+                if len(NON_PHONE_CHARS_RE.sub('', match.group(0))) < 10:  # Valid phone length
+                    pos = start + 1
+                    continue
+                contacts['phone'].append((start, match.group(0)))
+            else:
+                contacts['email'].append((start, match.group(0)))
+
+        return contacts
+
+    @_cached_extractor
+    def extract_email(self, text: str, contacts: Optional[Dict[str, List[tuple]]] = None) -> str:
+        """Extract primary email address intelligently (pass contacts if already computed)"""
+        if contacts is None:
+            contacts = self._scan_contacts(text)
+        # (start, text) for every email, the start gives the context below directly
+        emails = contacts['email']
 
         if not emails:
             return ""
@@ -118,10 +586,15 @@ class UniversalResumeParser:
         name = self.extract_name(text)
         name_parts = name.lower().split() if name else []
 
-        # Score emails based on multiple factors
-        email_scores = {}
+        # Score emails based on multiple factors, keeping the first best one
+        best_email, best_score = emails[0][1], float('-inf')
+        scored: Set[str] = set()
 
-        for email in emails:
+        for email_pos, email in emails:
+            # Repeated emails are scored on their first occurrence
+            if email in scored:
+                continue
+            scored.add(email)
             score = 0
             email_lower = email.lower()
             email_local = email_lower.split('@')[0]  # Part before @
@@ -134,131 +607,78 @@ class UniversalResumeParser:
                         score += 10  # Strong indicator
 
             # Common personal email patterns
-            personal_patterns = [
-                'gmail', 'yahoo', 'hotmail', 'outlook', 'icloud',
-                'protonmail', 'me.com', 'live.com'
-            ]
-            if any(pattern in email_lower for pattern in personal_patterns):
+            if self.personal_email_re.search(email_lower):
                 score += 5
 
             # NEGATIVE scoring (reference/business email indicators)
             # Skip obvious reference emails
-            reference_indicators = [
-                'noreply', 'admin', 'info', 'contact', 'support', 'help',
-                'hr@', 'jobs@', 'careers@', 'team@'
-            ]
-            if any(indicator in email_lower for indicator in reference_indicators):
+            if self.reference_email_re.search(email_lower):
                 score -= 20
 
             # Business domain patterns that might be references
-            business_patterns = ['benmcphail', 'company', 'corp', 'ltd']
-            if any(pattern in email_lower for pattern in business_patterns):
+            if self.business_email_re.search(email_lower):
                 score -= 5
 
             # Context analysis - check surrounding text
-            email_pos = text.lower().find(email_lower)
-            if email_pos != -1:
-                context = text[max(0, email_pos-50):email_pos+len(email)+50].lower()
-                # If email is near "contact" or reference keywords, likely a reference
-                if any(word in context for word in ['contact', 'reference', 'manager', 'supervisor']):
-                    score -= 15
-
-            email_scores[email] = score
-
-        # Return highest scoring email
-        if email_scores:
-            best_email = max(email_scores.items(), key=lambda x: x[1])
-            return best_email[0]
-
-        return emails[0]  # Fallback
-
-    def extract_phone(self, text: str) -> str:
-        """Extract primary phone number intelligently"""
-        phone_candidates = []
-
-        for pattern in self.phone_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                phone_text = match.group(0)
-                phone_start = match.start()
-
-                # Clean up phone number - preserve + and digits
-                cleaned_phone = re.sub(r'[^\d+]', '', phone_text)
-                if len(cleaned_phone) >= 10:  # Valid phone length
-
-                    # Store original phone text for return
-                    display_phone = phone_text.strip()
-
-                    # Analyze context to score the phone number
-                    context_start = max(0, phone_start - 100)
-                    context_end = min(len(text), phone_start + len(phone_text) + 100)
-                    context = text[context_start:context_end].lower()
-
-                    score = 0
-
-                    # NEGATIVE scoring for reference phones
-                    reference_indicators = [
-                        'contact:', 'reference:', 'manager:', 'supervisor:',
-                        'dr.', 'prof.', 'mr.', 'ms.', 'mrs.',
-                        'ben mcphail', 'christopher read'
-                    ]
-
-                    if any(indicator in context for indicator in reference_indicators):
-                        score -= 10
-
-                    # POSITIVE scoring for personal phone indicators
-                    personal_indicators = ['mobile:', 'cell:', 'phone:', 'tel:']
-                    if any(indicator in context for indicator in personal_indicators):
-                        score += 5
-
-                    # Prefer phones that appear earlier in document (usually personal info)
-                    if phone_start < len(text) * 0.3:  # First 30% of document
-                        score += 3
-
-                    phone_candidates.append({
-                        'phone': display_phone,
-                        'cleaned': cleaned_phone,
-                        'score': score,
-                        'position': phone_start
-                    })
-
-        if phone_candidates:
-            # Sort by score (highest first), then by position (earliest first)
-            phone_candidates.sort(key=lambda x: (-x['score'], x['position']))
-            return phone_candidates[0]['phone']
+            context = text[max(0, email_pos-50):email_pos+len(email)+50].lower()
+            # If email is near "contact" or reference keywords, likely a reference
+            if self.reference_context_re.search(context):
+                score -= 15
+
+            if score > best_score:
+                best_email, best_score = email, float(score)
+
+        return best_email
+
+    @_cached_extractor
+    def extract_phone(self, text: str, contacts: Optional[Dict[str, List[tuple]]] = None) -> str:
+        """Extract primary phone number intelligently (pass contacts if already computed)"""
+        if contacts is None:
+            contacts = self._scan_contacts(text)
+        # Best phone so far, phones come in document order so ties keep the earliest
+        best_phone, best_score = "", float('-inf')
+
+        for phone_start, phone_text in contacts['phone']:
+            # Analyze context to score the phone number
+            context_start = max(0, phone_start - 100)
+            context_end = min(len(text), phone_start + len(phone_text) + 100)
+            context = text[context_start:context_end].lower()
 
-        return ""
+            score = 0
 
-    def extract_references(self, text: str) -> List[Dict[str, str]]:
-        """Extract referee/reference information"""
-        references = []
+            # NEGATIVE scoring for reference phones
+            if self.reference_phone_re.search(context):
+                score -= 10
 
-        # Look for reference sections
-        ref_section_patterns = [
-            r'(?i)(references?|contacts?)\s*:?\s*(.*?)(?=\n\s*[A-Z]{2,}|\n\s*$|$)',
-            r'(?i)contact\s*:\s*([^\n]+(?:\n[^A-Z\n][^\n]*)*)',
-        ]
+            # POSITIVE scoring for personal phone indicators
+            if self.personal_phone_re.search(context):
+                score += 5
 
-        # Find reference indicators with context
-        ref_indicators = [
-            r'(?i)(dr\.|prof\.|mr\.|ms\.|mrs\.)\s+([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            r'(?i)(manager|supervisor|director|lead|head)\s*:?\s*([A-Z][a-z]+\s+[A-Z][a-z]+)',
-            r'(?i)contact\s*:?\s*[^\n]*?([A-Z][a-z]+\s+[A-Z][a-z]+)',
-        ]
+            # Prefer phones that appear earlier in document (usually personal info)
+            if phone_start < len(text) * 0.3:  # First 30% of document
+                score += 3
+
+            if score > best_score:
+                # Return the original phone text
+                best_phone, best_score = phone_text.strip(), float(score)
+
+        return best_phone
+
+    @_cached_extractor
+    def extract_references(self, text: str) -> List[Reference]:
+        """Extract referee/reference information"""
+        references: List[Dict[str, str]] = []
 
         # Extract email and phone patterns for references
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
         phone_patterns = self.phone_patterns
 
-        # Find potential reference blocks
-        lines = text.split('\n')
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+        # Find potential reference blocks, each line comes with the 2 before and 4 after it
+        for line, context_lines in _line_windows(text, before=2, after=4):
+            line = line.strip()
 
             # Check if line contains reference indicators
-            for pattern in ref_indicators:
-                match = re.search(pattern, line)
+            for pattern in REFERENCE_INDICATOR_PATTERNS:
+                match = pattern.search(line)
                 if match:
                     ref_name = match.group(2) if len(match.groups()) >= 2 else match.group(1)
 
@@ -266,17 +686,15 @@ class UniversalResumeParser:
                     ref_info = {'name': ref_name.strip()}
 
                     # Search next few lines for email/phone
-                    for j in range(max(0, i-2), min(len(lines), i+5)):
-                        context_line = lines[j]
-
+                    for context_line in context_lines:
                         # Find email
-                        email_match = re.search(email_pattern, context_line)
+                        email_match = EMAIL_RE.search(context_line)
                         if email_match and 'email' not in ref_info:
                             ref_info['email'] = email_match.group(0)
 
                         # Find phone
                         for phone_pattern in phone_patterns[:3]:  # Use simpler patterns
-                            phone_match = re.search(phone_pattern, context_line)
+                            phone_match = phone_pattern.search(context_line)
                             if phone_match and 'phone' not in ref_info:
                                 ref_info['phone'] = phone_match.group(0).strip()
                                 break
@@ -285,33 +703,35 @@ class UniversalResumeParser:
                     if len(ref_info) >= 2:
                         references.append(ref_info)
                     break
-            i += 1
 
         # Remove duplicates based on name
-        seen_names = set()
+        seen_names: Set[str] = set()
         unique_references = []
         for ref in references:
             if ref['name'] not in seen_names:
                 seen_names.add(ref['name'])
-                unique_references.append(ref)
+                unique_references.append(Reference(**ref))
 
         return unique_references
 
+    @_cached_extractor
     def extract_interests(self, text: str) -> List[str]:
         """Extract interests/hobbies from resume"""
-        interests = []
+        interests: List[str] = []
 
         # Find interests section more reliably
         # First, find where INTERESTS section starts
-        interests_match = re.search(r'(?i)\binterests?\b\s*\n', text)
+        interests_match = INTERESTS_HEADING_RE.search(text)
 
         if interests_match:
-            # Get everything after the INTERESTS heading
+            # Get the text between the INTERESTS heading and the next heading
             interests_start = interests_match.end()
-            interests_section = text[interests_start:].strip()
+            next_heading = NEXT_HEADING_RE.search(text, interests_start)
+            interests_end = next_heading.start() if next_heading else len(text)
+            interests_section = text[interests_start:interests_end].strip()
 
             # Split by lines and extract each interest
-            for line in interests_section.split('\n'):
+            for line in _iter_lines(interests_section):
                 line = line.strip()
 
                 # Skip empty lines and stop at whitespace blocks or very short lines
@@ -329,22 +749,24 @@ class UniversalResumeParser:
                     interests.append(line.title())
 
         # Remove duplicates while preserving order
-        seen = set()
-        unique_interests = []
+        seen: Set[str] = set()
+        unique_interests: List[str] = []
         for interest in interests:
-            if interest.lower() not in seen:
-                seen.add(interest.lower())
+            key = interest.lower()
+            if key not in seen:
+                seen.add(key)
                 unique_interests.append(interest)
 
         return unique_interests
 
-    def extract_companies(self, text: str) -> List[Dict[str, Any]]:
+    @_cached_extractor
+    def extract_companies(self, text: str) -> List[Company]:
         """Extract companies with dates from work experience sections"""
-        companies = []
+        companies: List[Company] = []
 
         # Look for work experience sections with dates
         # Pattern: Job Title \n Company Name \n Date Range, Location
-        work_sections = re.split(r'(?i)(programmer analyst|software engineer|developer|engineer)', text)
+        work_sections = JOB_TITLE_SPLIT_RE.split(text)
 
         for i in range(1, len(work_sections), 2):  # Skip every other match (the title itself)
             if i + 1 < len(work_sections):
@@ -358,16 +780,15 @@ class UniversalResumeParser:
 
                 for j, line in enumerate(lines):
                     line = line.strip()
-                    if line and any(suffix in line for suffix in self.company_suffixes):
+                    if line and self.company_suffix_any_re.search(line):
                         company_line = line
                         # Look for date in next few lines
                         for k in range(j + 1, min(j + 3, len(lines))):
                             next_line = lines[k].strip()
                             # Date pattern: MM/YYYY - MM/YYYY or MM/YYYY - Present
-                            if re.search(r'\d{1,2}/\d{4}\s*-\s*(\d{1,2}/\d{4}|Present)', next_line):
-                                date_match = re.search(r'(\d{1,2}/\d{4}\s*-\s*(?:\d{1,2}/\d{4}|Present))', next_line)
-                                if date_match:
-                                    date_line = date_match.group(1).strip()
+                            date_match = JOB_DATES_RE.search(next_line)
+                            if date_match:
+                                date_line = date_match.group(1).strip()
                                 break
                         break
 
@@ -378,69 +799,44 @@ class UniversalResumeParser:
                     # Extract job position/title
                     position = title.title() if title else "Software Professional"
 
-                    companies.append({
-                        'name': company_name,
-                        'position': position,
-                        'dates': date_line if date_line else "Date not specified",
-                        'confidence': 15 if date_line else 10
-                    })
+                    companies.append(Company(
+                        name=company_name,
+                        position=position,
+                        dates=date_line if date_line else "Date not specified",
+                        confidence=15 if date_line else 10
+                    ))
 
-        # Deduplicate similar companies
-        final_companies = []
-        seen_companies = set()
+        # Deduplicate similar companies by their canonical name
+        best: Dict[str, Company] = {}
 
         for company in companies:
-            company_lower = company['name'].lower()
-            is_duplicate = False
-
-            for seen in seen_companies:
-                if (company_lower in seen.lower() or seen.lower() in company_lower):
-                    # Keep the one with better date information or longer name
-                    existing = next((c for c in final_companies if seen.lower() in c['name'].lower()), None)
-                    if existing and (len(company['name']) > len(existing['name']) or
-                                   (company['dates'] != "Date not specified" and existing['dates'] == "Date not specified")):
-                        final_companies.remove(existing)
-                        seen_companies.discard(seen)
-                    else:
-                        is_duplicate = True
-                    break
-
-            if not is_duplicate:
-                final_companies.append(company)
-                seen_companies.add(company_lower)
-
-        return final_companies
-
-    def extract_skills_adaptive(self, text: str) -> List[str]:
+            key = self._company_key(company.name)
+            existing = best.get(key)
+            # Keep the one with better date information or longer name
+            if existing is None or (len(company.name) > len(existing.name) or
+                                    (company.dates != "Date not specified" and existing.dates == "Date not specified")):
+                best[key] = company
+
+        return list(best.values())
+
+    def _company_key(self, name: str) -> str:
+        """Canonical company name: lowercased without punctuation or trailing legal suffixes"""
+        # "Acme Pty Ltd." and "ACME" both become "acme", "Acme Solutions" stays "acme solutions"
+        suffix = self.legal_suffix_tail_re.search(name)
+        if suffix and suffix.start() > 0:
+            name = name[:suffix.start()]
+        words = NON_WORD_RE.sub(' ', name).lower().split()
+        return ' '.join(words) if words else name.lower()
+
+    @_cached_extractor
+    def extract_skills_adaptive(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """Extract skills adaptively from context - focus on technical skills"""
-        skills = set()
-
-        # Known technical skills (curated list)
-        technical_skills = {
-            'Python', 'JavaScript', 'TypeScript', 'Java', 'C#', 'C++', 'Go', 'Rust',
-            'PHP', 'Ruby', 'Swift', 'Kotlin', 'Scala', 'R', 'MATLAB',
-            'React', 'Angular', 'Vue', 'Svelte', 'Node.js', 'Express', 'Django',
-            'Flask', 'Spring', 'Laravel', 'Ruby on Rails', 'ASP.NET',
-            'AWS', 'Lambda', 'EC2', 'S3', 'DynamoDB', 'CloudFormation', 'CloudWatch',
-            'API Gateway', 'Elastic Beanstalk', 'RDS', 'VPC', 'IAM', 'CodePipeline',
-            'CodeDeploy', 'SES', 'Azure', 'GCP', 'Google Cloud', 'Kubernetes', 'Docker',
-            'Terraform', 'Ansible', 'Jenkins', 'GitLab CI', 'GitHub Actions',
-            'MongoDB', 'PostgreSQL', 'MySQL', 'SQLite', 'Redis', 'Elasticsearch',
-            'Oracle', 'SQL Server', 'Cassandra', 'Neo4j', 'DynamoDB',
-            'Git', 'GitHub', 'GitLab', 'Jira', 'Confluence', 'Linux', 'HTML', 'CSS',
-            'GraphQL', 'REST', 'API', 'APIs', 'JSON', 'XML', 'YAML'
-        }
-
-        # Section-based extraction - look for skills section first
-        skills_section_patterns = [
-            r'(?i)(technical\s+skills?|skills?|technologies)\s*:?\s*(.*?)(?=\n\s*[A-Z]{2,}|\n\s*$|$)',
-            r'(?i)technologies\s*:?\s*(.*?)(?=\n\s*[A-Z]{2,}|\n\s*$|$)'
-        ]
+        skills: Set[str] = set()
 
         # First try to find a dedicated skills section
         skills_text = ""
-        for pattern in skills_section_patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.MULTILINE)
+        for pattern in SKILLS_SECTION_PATTERNS:
+            matches = pattern.findall(text)
             if matches:
                 if isinstance(matches[0], tuple):
                     skills_text += " " + matches[0][1]
@@ -452,14 +848,21 @@ class UniversalResumeParser:
             search_text = skills_text.lower()
         else:
             # Fall back to searching the entire document
-            search_text = text.lower()
+            search_text = text_lower if text_lower is not None else text.lower()
 
         # Extract known technical skills
-        for skill in technical_skills:
-            # Use word boundaries for more precise matching
-            pattern = rf'\b{re.escape(skill.lower())}\b'
-            if re.search(pattern, search_text):
-                skills.add(skill)
+        if SKILL_DATABASE is not None:
+            skills |= _hyperscan_skills(search_text)
+        elif SKILL_AUTOMATON is not None:
+            # One pass finds every occurrence, keep the whole-word ones
+            for end, (skill, length) in SKILL_AUTOMATON.iter(search_text):
+                if _at_word_boundary(search_text, end - length + 1) and _at_word_boundary(search_text, end + 1):
+                    skills.add(skill)
+        else:
+            for skill, pattern in SKILL_PATTERNS.items():
+                # Use word boundaries for more precise matching
+                if pattern.search(search_text):
+                    skills.add(skill)
 
         # Filter out obvious false positives that might have slipped through
         false_positive_skills = {
@@ -479,36 +882,29 @@ class UniversalResumeParser:
 
         return filtered_skills
 
-    def extract_education(self, text: str) -> List[Dict[str, str]]:
+    @_cached_extractor
+    def extract_education(self, text: str) -> List[Education]:
         """Extract education information with dates"""
-        education_entries = []
+        education_entries: List[Education] = []
 
         # Look for education section
-        education_section_match = re.search(r'(?i)education\s*(.*?)(?=\n\s*[A-Z]{2,}|\n\s*$|$)', text, re.DOTALL)
+        education_section_match = EDUCATION_SECTION_RE.search(text)
 
         if education_section_match:
             education_text = education_section_match.group(1)
 
             # Split by degree programs
-            lines = education_text.split('\n')
-            current_entry = {}
+            current_entry: Dict[str, str] = {}
 
-            for line in lines:
+            for line in _iter_lines(education_text):
                 line = line.strip()
                 if not line or len(line) < 3:
                     continue
 
                 # Check for degree patterns
-                degree_patterns = [
-                    r'(?i)bachelor\s+of\s+([A-Za-z\s]+)',
-                    r'(?i)master\s+of\s+([A-Za-z\s]+)',
-                    r'(?i)(bachelor|master|phd|doctorate)\s+([A-Za-z\s]+)',
-                    r'(?i)(b\.?\s*[a-z]+|m\.?\s*[a-z]+|phd|ph\.?d\.?)'
-                ]
-
                 degree_found = False
-                for pattern in degree_patterns:
-                    match = re.search(pattern, line)
+                for pattern in EDUCATION_DEGREE_PATTERNS:
+                    match = pattern.search(line)
                     if match:
                         if len(match.groups()) > 1:
                             current_entry['degree'] = f"{match.group(1)} {match.group(2)}".strip().title()
@@ -518,57 +914,55 @@ class UniversalResumeParser:
                         break
 
                 # Check for institutions
-                if 'university' in line.lower() or 'college' in line.lower() or 'institute' in line.lower():
+                line_lower = line.lower()
+                if 'university' in line_lower or 'college' in line_lower or 'institute' in line_lower:
                     current_entry['institution'] = line
 
                 # Check for dates
-                date_match = re.search(r'(\d{1,2}/\d{4}\s*-\s*\d{1,2}/\d{4})', line)
+                date_match = EDUCATION_DATES_RE.search(line)
                 if date_match:
                     current_entry['dates'] = date_match.group(1)
 
                 # Check for location
-                location_patterns = [
-                    r'([A-Z][a-z]+,\s*[A-Z]{2,3})',  # City, State/Country
-                    r'([A-Z][a-z]+,\s*[A-Z][a-z]+)'  # City, Country
-                ]
-                for pattern in location_patterns:
-                    location_match = re.search(pattern, line)
+                for pattern in EDUCATION_LOCATION_PATTERNS:
+                    location_match = pattern.search(line)
                     if location_match:
                         current_entry['location'] = location_match.group(1)
 
                 # If we found a degree and have some info, add to entries
                 if degree_found and current_entry:
-                    if current_entry not in education_entries:
-                        education_entries.append(current_entry.copy())
+                    entry = Education(**current_entry)
+                    if entry not in education_entries:
+                        education_entries.append(entry)
                     current_entry = {}
 
             # Add any remaining entry
             if current_entry and ('degree' in current_entry or 'institution' in current_entry):
-                education_entries.append(current_entry)
+                education_entries.append(Education(**current_entry))
 
         # If no structured education section found, try legacy approach
         if not education_entries:
             for pattern in self.degree_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
+                matches = pattern.findall(text)
                 for match in matches:
                     if isinstance(match, str) and len(match) > 3:
-                        education_entries.append({'degree': match.strip()})
+                        education_entries.append(Education(degree=match.strip()))
 
         return education_entries
 
+    @_cached_extractor
     def extract_certifications(self, text: str) -> List[str]:
         """Extract certifications using improved patterns"""
-        certifications = []
+        certifications: List[str] = []
 
         # Handle ligature characters (ﬁ, ﬂ) that appear in PDFs
         text_clean = text.replace('ﬁ', 'fi').replace('ﬂ', 'fl').replace('–', '-')
 
         # Find CERTIFICATIONS section and extract content
-        lines = text_clean.split('\n')
         in_cert_section = False
-        cert_lines = []
+        cert_lines: List[str] = []
 
-        for line in lines:
+        for line in _iter_lines(text_clean):
             line = line.strip()
 
             if line.upper() == 'CERTIFICATIONS':
@@ -586,7 +980,8 @@ class UniversalResumeParser:
         current_cert = ""
         for line in cert_lines:
             # Check if line looks like a certification title
-            if ('certified' in line.lower() or 'certificate' in line.lower()) and len(line) > 10:
+            line_lower = line.lower()
+            if ('certified' in line_lower or 'certificate' in line_lower) and len(line) > 10:
                 if current_cert:
                     certifications.append(current_cert.strip())
                 current_cert = line
@@ -613,69 +1008,41 @@ class UniversalResumeParser:
 
         return cleaned_certs
 
-    def extract_location(self, text: str) -> str:
-        """Extract location using intelligent filtering"""
-        # International location patterns
-        location_patterns = [
-            # City, State/Province (full names)
-            r'([A-Z][a-z]+,\s*Queensland)',
-            r'([A-Z][a-z]+,\s*New South Wales)',
-            r'([A-Z][a-z]+,\s*Victoria)',
-            r'([A-Z][a-z]+,\s*California)',
-            r'([A-Z][a-z]+,\s*New York)',
-            # City, State/Province abbreviations
-            r'([A-Z][a-z]+,\s*QLD)',
-            r'([A-Z][a-z]+,\s*NSW)',
-            r'([A-Z][a-z]+,\s*VIC)',
-            r'([A-Z][a-z]+,\s*ACT)',
-            # Generic patterns (but we'll filter these)
-            r'([A-Z][a-z]+,\s*[A-Z][a-z]+)',
-        ]
+    @_cached_extractor
+    def extract_location(self, text: str, contacts: Optional[Dict[str, List[tuple]]] = None) -> str:
+        """Extract location using intelligent filtering (pass contacts if already computed)"""
+        if contacts is None:
+            contacts = self._scan_contacts(text)
+        location_candidates: List[Dict[str, Any]] = []
 
-        location_candidates = []
-
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                # Score locations based on likelihood
-                score = 0
-
-                # POSITIVE scoring for real locations
-                real_locations = [
-                    'brisbane', 'sydney', 'melbourne', 'perth', 'adelaide', 'canberra',
-                    'queensland', 'new south wales', 'victoria', 'qld', 'nsw', 'vic', 'act',
-                    'new york', 'california', 'london', 'toronto', 'vancouver'
-                ]
-
-                match_lower = match.lower()
-                if any(loc in match_lower for loc in real_locations):
-                    score += 10
-
-                # NEGATIVE scoring for false positives
-                false_positives = [
-                    'lambda', 'ec2', 'api', 'react', 'python', 'node', 'gateway',
-                    'deploy', 'code', 'script', 'elastic'
-                ]
-
-                if any(fp in match_lower for fp in false_positives):
-                    score -= 20
-
-                # Context analysis
-                match_pos = text.lower().find(match.lower())
-                if match_pos != -1:
-                    context = text[max(0, match_pos-50):match_pos+len(match)+50].lower()
-                    # If near personal info section, higher score
-                    if any(keyword in context for keyword in ['email', 'phone', 'address', 'australia']):
-                        score += 5
-
-                location_candidates.append({
-                    'location': match,
-                    'score': score
-                })
+        for match_pos, match, pattern in contacts['location']:
+            # Score locations based on likelihood
+            score = 0
+
+            # POSITIVE scoring for real locations
+            match_lower = match.lower()
+            if self.real_location_re.search(match_lower):
+                score += 10
+
+            # NEGATIVE scoring for false positives
+            if self.false_location_re.search(match_lower):
+                score -= 20
+
+            # Context analysis
+            context = text[max(0, match_pos-50):match_pos+len(match)+50].lower()
+            # If near personal info section, higher score
+            if self.personal_context_re.search(context):
+                score += 5
+
+            location_candidates.append({
+                'location': match,
+                'score': score,
+                'pattern': pattern
+            })
 
         if location_candidates:
-            # Sort by score and return highest
-            location_candidates.sort(key=lambda x: -x['score'])
+            # Sort by score and return highest, ties go to the more specific (earlier) pattern
+            location_candidates.sort(key=lambda x: (-x['score'], x['pattern']))
             best_location = location_candidates[0]
             if best_location['score'] > 0:  # Only return if positive score
                 return best_location['location']
@@ -689,38 +1056,86 @@ class UniversalResumeParser:
         if not text:
             return {}
 
-        parsed_data = {
+        return self._parse_text(text, self.extract_name(text))
+
+    def parse_resumes(self, pdf_paths: List[str], batch_size: int = 64,
+                      n_process: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Parse several resumes, running name NER for all of them in one nlp.pipe() call
+
+        Results are in the same order as pdf_paths; n_process defaults to one worker
+        per spare core, capped at the number of batches so small runs stay in-process.
+        """
+        if len(pdf_paths) == 1:
+            return [self.parse_resume(pdf_paths[0])]
+
+        texts = [self.extract_text_from_pdf(path) for path in pdf_paths]
+        names = [""] * len(texts)
+        candidates, indices = [], []
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            lines = self._head_lines(text)
+            names[i] = self._name_from_lines(lines)
+            if not names[i]:
+                candidates.append(self._name_candidate(lines))
+                indices.append(i)
+
+        if candidates and self.nlp:
+            if n_process is None:
+                batches = -(-len(candidates) // batch_size)
+                n_process = max(1, min((os.cpu_count() or 1) - 1, batches))
+            docs = self.nlp.pipe(candidates, batch_size=batch_size, n_process=n_process)
+            for doc, i in zip(docs, indices):
+                names[i] = self._name_from_doc(doc)
+
+        return [self._parse_text(text, name) if text else {} for text, name in zip(texts, names)]
+
+    def _parse_text(self, text: str, name: str) -> Dict[str, Any]:
+        """Build the parsed resume from extracted text and an already resolved name"""
+        # Run each extractor once, the stats below reuse the same results.
+        # The lowercased text and the contact scan are shared by the extractors that use them.
+        text_lower = text.lower()
+        contacts = self._scan_contacts(text)
+        # The name is extract_name's result (parse_resumes runs its NER in a batch),
+        # record it so extract_email doesn't resolve it again
+        self._extractor_results(text).setdefault('extract_name', name)
+        companies = self.extract_companies(text)
+        skills = self.extract_skills_adaptive(text, text_lower)
+        references = self.extract_references(text)
+
+        parsed_data: Dict[str, Any] = {
             "personal": {
-                "name": self.extract_name(text),
-                "email": self.extract_email(text),
-                "phone": self.extract_phone(text),
-                "location": self.extract_location(text)
+                "name": name,
+                "email": self.extract_email(text, contacts),
+                "phone": self.extract_phone(text, contacts),
+                "location": self.extract_location(text, contacts)
             },
             "experience": {
-                "companies": self.extract_companies(text)
+                "companies": companies
             },
-            "skills": self.extract_skills_adaptive(text),
+            "skills": skills,
             "education": self.extract_education(text),
             "certifications": self.extract_certifications(text),
             "interests": self.extract_interests(text),
-            "references": self.extract_references(text),
+            "references": references,
             "parsing_stats": {
                 "text_length": len(text),
-                "companies_found": len(self.extract_companies(text)),
-                "skills_found": len(self.extract_skills_adaptive(text)),
-                "references_found": len(self.extract_references(text))
+                "companies_found": len(companies),
+                "skills_found": len(skills),
+                "references_found": len(references)
             }
         }
 
         return parsed_data
 
-def test_universal_parser():
+def test_universal_parser() -> Dict[str, Any]:
     """Test the universal parser"""
     parser = UniversalResumeParser()
     result = parser.parse_resume('Nirwan-resume-latest.pdf')
 
     print("=== UNIVERSAL RESUME PARSING RESULT ===")
-    print(json.dumps(result, indent=2, default=str))
+    print(json.dumps(result, indent=2, default=lambda o: asdict(o) if is_dataclass(o) and not isinstance(o, type) else str(o)))
 
     return result
 
@@ -1,7 +1,13 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
 import json
 import re
+import time
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 
 # Page configuration
 st.set_page_config(
@@ -11,8 +17,9 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS for better styling, whitespace collapsed once at startup since it is
+# sent to the browser again on every rerun
+CUSTOM_CSS = re.sub(r'\s+', ' ', """
 <style>
     .main-header {
         text-align: center;
@@ -36,6 +43,9 @@ st.markdown("""
     .status-error {
         background-color: #ef4444;
     }
+    .status-checking {
+        background-color: #f59e0b;
+    }
     @keyframes pulse {
         0% { opacity: 1; }
         50% { opacity: 0.5; }
@@ -57,160 +67,284 @@ st.markdown("""
     .stChatMessage {
         margin-bottom: 1rem;
     }
-    .think-content {
-        display: none;
-    }
-    .think-toggle {
-        background: #f0f0f0;
-        border: 1px solid #ddd;
-        border-radius: 4px;
-        padding: 4px 8px;
-        font-size: 0.8rem;
-        color: #666;
-        cursor: pointer;
-        margin: 8px 0;
-        display: inline-block;
-    }
-    .think-toggle:hover {
-        background: #e0e0e0;
-    }
-    @media (prefers-color-scheme: dark) {
-        .think-toggle {
-            background: #3a3a3a !important;
-            border-color: #555 !important;
-            color: #ccc !important;
-        }
-        .think-toggle:hover {
-            background: #4a4a4a !important;
-        }
-    }
 </style>
-""", unsafe_allow_html=True)
+""").strip()
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # API Configuration
 BACKEND_URL = "http://localhost:8000"
+# Seconds a backend health result is reused before it is rechecked in the background
+HEALTH_TTL = 10
+# Seconds the very first page load waits for a health result before rendering without one
+HEALTH_FIRST_WAIT = 1
+# Most recent messages rendered on each rerun; older ones are only drawn on request
+RENDER_WINDOW = 30
+# Answered questions kept for repeats, and for how long (seconds)
+ANSWER_CACHE_SIZE = 256
+ANSWER_CACHE_TTL = 3600
+
+WELCOME_MESSAGE = """
+👋 **Welcome!** I'm Nirwan's AI resume assistant. I can help you learn about:
+
+- 💼 **Professional Experience** - Companies, roles, and achievements
+- 🛠️ **Technical Skills** - Programming languages, frameworks, and tools
+- 🎓 **Education & Certifications** - Academic background and training
+- 🚀 **Projects & Portfolio** - Notable work and accomplishments
+- 📍 **Career Goals** - Interests and aspirations
+
+Feel free to ask anything about Nirwan's background!
+"""
+
+SAMPLE_QUESTIONS = (
+    "What companies has Nirwan worked for?",
+    "What are his main technical skills?",
+    "Tell me about his education background",
+    "What projects has he worked on?",
+    "What programming languages does he know?"
+)
 
-def check_backend_health():
-    """Check if the backend API is healthy"""
-    try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=5)
-        if response.status_code == 200:
-            health_data = response.json()
-            return True, health_data
-        return False, None
-    except Exception as e:
-        return False, str(e)
+# Blank lines left behind where <think></think> reasoning blocks are removed
+EXTRA_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+
+@st.cache_resource
+def get_session():
+    """HTTP session shared across reruns, so backend connections are kept alive"""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+def health_result(response):
+    """(healthy, health data) from a /health response"""
+    if response.status_code == 200:
+        health_data = response.json()
+        return True, health_data
+    return False, None
+
+class HealthMonitor:
+    """Backend health checked on a background thread, so page runs never wait on /health"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._checked_at = None
+        self._result = None
+
+    def status(self):
+        """
+        Last known (healthy, health data, checking)
+
+        healthy is None until the first check finishes. A check is started in the
+        background whenever the result is older than HEALTH_TTL.
+        """
+        with self._lock:
+            stale = self._checked_at is None or time.monotonic() - self._checked_at >= HEALTH_TTL
+            if stale and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._check, daemon=True)
+                self._thread.start()
+            thread = self._thread
+
+        # Only the first load of the app has nothing to show; give it a moment
+        if self._result is None:
+            thread.join(HEALTH_FIRST_WAIT)
+
+        result = self._result
+        if result is None:
+            return None, None, True
+        return result[0], result[1], thread.is_alive()
+
+    def invalidate(self):
+        """Have the next status() call recheck, keeping the last result meanwhile"""
+        with self._lock:
+            self._checked_at = None
+
+    def _check(self):
+        try:
+            result = health_result(get_session().get(f"{BACKEND_URL}/health", timeout=5))
+        except Exception as e:
+            result = (False, str(e))
+        with self._lock:
+            self._result = result
+            self._checked_at = time.monotonic()
+
+@st.cache_resource
+def get_health_monitor():
+    """Health monitor shared by all sessions"""
+    return HealthMonitor()
+
+TIMEOUT_ERROR = "Request timed out. The model might be processing a complex query."
+
+class ChatStream:
+    """Text chunks of a streamed /chat answer; error is set if the stream breaks off"""
+
+    def __init__(self, response):
+        self.response = response
+        # Sources are known before generation starts, so the backend sends them as a header
+        self.sources = json.loads(response.headers.get("X-Sources", "[]"))
+        self.error = None
+        if response.encoding is None:
+            response.encoding = "utf-8"
+
+    def __iter__(self):
+        with self.response:
+            try:
+                yield from self.response.iter_content(chunk_size=None, decode_unicode=True)
+            except requests.exceptions.RequestException as e:
+                # requests reports a read timeout mid-stream as a ConnectionError
+                if isinstance(e, requests.exceptions.Timeout) or (e.args and isinstance(e.args[0], ReadTimeoutError)):
+                    self.error = TIMEOUT_ERROR
+                else:
+                    self.error = f"Connection error: {str(e)}"
 
-def send_chat_message(question):
-    """Send a message to the chat API"""
+def stream_chat_message(question):
+    """Start a streamed answer from the chat API: (True, ChatStream) or (False, error)"""
     try:
-        response = requests.post(
+        response = get_session().post(
             f"{BACKEND_URL}/chat",
+            # Think blocks are split out here, for the reasoning expander
+            params={"strip_think": "false"},
             json={"question": question},
-            timeout=30,
-            headers={"Content-Type": "application/json"}
+            stream=True,
+            timeout=30
         )
-
-        if response.status_code == 200:
-            return True, response.json()
-        else:
-            return False, f"API Error: {response.status_code} - {response.text}"
     except requests.exceptions.Timeout:
-        return False, "Request timed out. The model might be processing a complex query."
+        return False, TIMEOUT_ERROR
     except Exception as e:
         return False, f"Connection error: {str(e)}"
 
-def process_think_content(text):
-    """Process text to handle <think></think> tags for display"""
-    # Find all <think></think> blocks
-    think_pattern = r'<think>(.*?)</think>'
-
-    # Check if there are any think blocks
-    think_matches = re.findall(think_pattern, text, flags=re.DOTALL)
-    if not think_matches:
-        return text, []
-
-    # Remove think content from the main text
-    clean_text = re.sub(think_pattern, '', text, flags=re.DOTALL)
-    clean_text = re.sub(r'\n\s*\n\s*\n', '\n\n', clean_text.strip())
-
-    return clean_text, think_matches
-
-def strip_think_content(text):
-    """Strip <think></think> content from text for message history"""
-    # Remove all <think></think> blocks
-    think_pattern = r'<think>.*?</think>'
-    cleaned_text = re.sub(think_pattern, '', text, flags=re.DOTALL)
-
-    # Clean up any extra whitespace
-    cleaned_text = re.sub(r'\n\s*\n\s*\n', '\n\n', cleaned_text.strip())
-
-    return cleaned_text
-
-# Initialize session state
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-
-if "backend_status" not in st.session_state:
-    st.session_state.backend_status = None
-
-# Header with status indicator
-health_status, health_data = check_backend_health()
-status_class = "status-healthy" if health_status else "status-error"
-status_text = "Online" if health_status else "Offline"
-
-st.markdown(f"""
-<div class="main-header">
-    <h1>🤖 Nirwan Raj Nagpal</h1>
-    <p>Resume Assistant & Career Chatbot</p>
-    <p><span class="{status_class} status-indicator"></span>Status: {status_text}</p>
-</div>
-""", unsafe_allow_html=True)
-
-# Show backend status info
-if health_status and health_data:
-    collection_count = health_data.get('collection_count', 0)
-    st.markdown(f"""
-    <div class="chat-info">
-        ✅ <strong>System Ready:</strong> Backend connected • {collection_count} resume sections loaded • Ollama model active
-    </div>
-    """, unsafe_allow_html=True)
-else:
-    st.error("⚠️ Backend API is not responding. Please ensure the FastAPI server is running on port 8000.")
-    st.stop()
-
-# Welcome message
-if not st.session_state.messages:
-    with st.chat_message("assistant"):
-        st.markdown("""
-        👋 **Welcome!** I'm Nirwan's AI resume assistant. I can help you learn about:
-
-        - 💼 **Professional Experience** - Companies, roles, and achievements
-        - 🛠️ **Technical Skills** - Programming languages, frameworks, and tools
-        - 🎓 **Education & Certifications** - Academic background and training
-        - 🚀 **Projects & Portfolio** - Notable work and accomplishments
-        - 📍 **Career Goals** - Interests and aspirations
-
-        Feel free to ask anything about Nirwan's background!
-        """)
-
-# Display chat messages
-for message in st.session_state.messages:
+    if response.status_code != 200:
+        error_msg = f"API Error: {response.status_code} - {response.text}"
+        response.close()
+        return False, error_msg
+
+    return True, ChatStream(response)
+
+@st.cache_resource
+def get_answer_cache():
+    """Answers shared by all sessions, keyed by normalized question, plus the lock guarding them"""
+    return OrderedDict(), threading.Lock()
+
+def normalize_question(question):
+    """Case- and whitespace-insensitive key for a question"""
+    return " ".join(question.lower().split())
+
+def get_cached_answer(question):
+    """Stored assistant message for a question asked before, or None"""
+    answers, lock = get_answer_cache()
+    key = normalize_question(question)
+    with lock:
+        item = answers.get(key)
+        if item is None:
+            return None
+        if time.monotonic() - item[0] >= ANSWER_CACHE_TTL:
+            del answers[key]
+            return None
+        answers.move_to_end(key)
+    return dict(item[1])
+
+def remember_answer(question, message):
+    """Keep a real answer (never an error or empty reply) so the same question is answered instantly next time"""
+    answers, lock = get_answer_cache()
+    key = normalize_question(question)
+    with lock:
+        answers[key] = (time.monotonic(), message)
+        answers.move_to_end(key)
+        while len(answers) > ANSWER_CACHE_SIZE:
+            answers.popitem(last=False)
+
+def partial_tag_len(buffer, tag):
+    """Length of the longest prefix of tag that buffer ends with"""
+    for length in range(min(len(tag) - 1, len(buffer)), 0, -1):
+        if buffer.endswith(tag[:length]):
+            return length
+    return 0
+
+class ThinkSplitter:
+    """
+    Split a streamed answer into visible text and <think></think> blocks as chunks arrive
+
+    Fed from /chat?strip_think=false, which passes the model's reasoning through
+    instead of dropping it on the backend.
+    """
+
+    def __init__(self):
+        self.think_blocks = []
+
+    def split(self, chunks):
+        """Yield the text outside <think> tags (tags may be split across chunks), collecting think blocks"""
+        buffer = ""
+        think = None  # parts of the open think block, None outside one
+        started = False
+
+        for chunk in chunks:
+            buffer += chunk
+            while True:
+                tag = "</think>" if think is not None else "<think>"
+                index = buffer.find(tag)
+                if index == -1:
+                    # Hold back anything that could be the start of a tag
+                    keep = partial_tag_len(buffer, tag)
+                    text, buffer = buffer[:len(buffer) - keep], buffer[len(buffer) - keep:]
+                else:
+                    text, buffer = buffer[:index], buffer[index + len(tag):]
+
+                if think is not None:
+                    think.append(text)
+                elif text:
+                    if not started:
+                        text = text.lstrip()
+                        started = bool(text)
+                    if text:
+                        yield text
+
+                if index == -1:
+                    break
+                if think is None:
+                    think = []
+                else:
+                    self.think_blocks.append("".join(think))
+                    think = None
+
+        # An unclosed block still counts as reasoning rather than answer
+        if think is not None:
+            self.think_blocks.append("".join(think) + buffer)
+        elif buffer:
+            yield buffer
+
+def clear_when_started(chunks, placeholder):
+    """Pass chunks through, emptying placeholder when the first one arrives"""
+    chunks = iter(chunks)
+    for chunk in chunks:
+        placeholder.empty()
+        yield chunk
+        break
+    yield from chunks
+
+def render_think_blocks(think_blocks):
+    """Show think blocks in a collapsed expander, numbered when there are several"""
+    if not think_blocks:
+        return
+
+    multi_step = len(think_blocks) > 1
+    with st.expander("🤔 Reasoning Process", expanded=False):
+        for i, think_content in enumerate(think_blocks, 1):
+            if multi_step:
+                if i > 1:
+                    st.write("---")
+                st.write(f"**Step {i}:**")
+            st.text(think_content.strip())
+
+def render_message(message):
+    """Render one stored chat message"""
     with st.chat_message(message["role"]):
         if message["role"] == "assistant":
-            # Process think content for display (in case old messages have it)
-            clean_content, think_blocks = process_think_content(message["content"])
-            st.markdown(clean_content)
+            # Content and think blocks were separated when the message was stored
+            st.markdown(message["content"])
+            think_blocks = message.get("think_blocks")
 
             # Show thinking process if it exists
-            if think_blocks:
-                with st.expander("🤔 Reasoning Process", expanded=False):
-                    for i, think_content in enumerate(think_blocks):
-                        if len(think_blocks) > 1:
-                            st.write(f"**Step {i+1}:**")
-                        st.text(think_content.strip())
-                        if i < len(think_blocks) - 1:
-                            st.write("---")
+            render_think_blocks(think_blocks)
         else:
             st.markdown(message["content"])
 
@@ -220,75 +354,196 @@ for message in st.session_state.messages:
                 sources = message["sources"]
                 if sources:
                     st.write("Information retrieved from:")
-                    for i, source in enumerate(set(sources), 1):
+                    for source in sources:
                         st.write(f"• {source}")
                 else:
                     st.write("General knowledge response")
 
-# Chat input
-if prompt := st.chat_input("Ask about Nirwan's experience, skills, projects..."):
-    # Add user message
-    st.session_state.messages.append({"role": "user", "content": prompt})
+@lru_cache(maxsize=16)
+def header_html(status_class, status_text):
+    """Header markdown, built once per backend status"""
+    return f"""
+<div class="main-header">
+    <h1>🤖 Nirwan Raj Nagpal</h1>
+    <p>Resume Assistant & Career Chatbot</p>
+    <p><span class="{status_class} status-indicator"></span>Status: {status_text}</p>
+</div>
+"""
+
+@lru_cache(maxsize=16)
+def ready_banner_html(collection_count):
+    """Markdown for the "System Ready" banner, built once per collection size"""
+    return f"""
+    <div class="chat-info">
+        ✅ <strong>System Ready:</strong> Backend connected • {collection_count} resume sections loaded • Ollama model active
+    </div>
+    """
+
+def show_error(error, partial_answer=""):
+    """Show a failed request and keep it in the chat history"""
+    error_msg = f"❌ **Error:** {error}"
+    st.error(error_msg)
+    st.session_state.messages.append({
+        "role": "assistant",
+        "content": f"{partial_answer}\n\n{error_msg}" if partial_answer else error_msg
+    })
+
+def answer_question(question):
+    """Show a question and its answer, and add both to the chat history"""
+    st.session_state.messages.append({"role": "user", "content": question})
     with st.chat_message("user"):
-        st.markdown(prompt)
+        st.markdown(question)
+
+    # Get assistant response, reusing the answer if this question was asked before
+    cached_message = get_cached_answer(question)
+    if cached_message is not None:
+        render_message(cached_message)
+        st.session_state.messages.append(cached_message)
+    else:
+        with st.chat_message("assistant"):
+            with st.spinner("Thinking..."):
+                success, response_data = stream_chat_message(question)
+
+            if not success:
+                show_error(response_data)
+                return
+
+            stream = response_data
+            # Deduplicated once here, keeping the order the backend ranked them in
+            sources = list(dict.fromkeys(stream.sources))
+
+            # Show answer tokens as they arrive, setting think blocks aside for the expander.
+            # Reasoning comes first and stays hidden, so say so until the answer starts
+            splitter = ThinkSplitter()
+            indicator = st.empty()
+            indicator.caption("🤔 Reasoning…")
+            clean_content = st.write_stream(clear_when_started(splitter.split(stream), indicator))
+            indicator.empty()
+            if stream.error is not None:
+                # Not stored as an answer (or cached), the partial text is kept for context
+                show_error(stream.error, clean_content)
+                return
+
+            think_blocks = splitter.think_blocks
+            if think_blocks:
+                clean_content = EXTRA_BLANK_LINES_RE.sub('\n\n', clean_content.strip())
+            answered = bool(clean_content)
+            if not answered:
+                clean_content = "Sorry, I couldn't generate a response."
+                st.markdown(clean_content)
 
-    # Get assistant response
-    with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            success, response_data = send_chat_message(prompt)
+            # Show thinking process if it exists
+            render_think_blocks(think_blocks)
+
+            # Store message with think content split out, so reruns don't parse it again
+            message = {
+                "role": "assistant",
+                "content": clean_content,
+                "think_blocks": think_blocks,
+                "sources": sources
+            }
+            st.session_state.messages.append(message)
+            if answered:
+                remember_answer(question, message)
+
+            # Show sources
+            if sources:
+                with st.expander("📚 Sources", expanded=False):
+                    st.write("Information retrieved from:")
+                    for source in sources:
+                        st.write(f"• {source}")
 
-            if success:
-                answer = response_data.get("answer", "Sorry, I couldn't generate a response.")
-                sources = response_data.get("sources", [])
+@st.fragment
+def chat_panel():
+    """
+    Chat history, input and responses
+
+    A fragment, so sending a message reruns only this part of the page rather than
+    the header, health check and sidebar.
+    """
+    # Set by a sample question button before this (full) rerun
+    question = st.session_state.pop("pending_question", None)
+
+    # Welcome message
+    if not st.session_state.messages and question is None:
+        with st.chat_message("assistant"):
+            st.markdown(WELCOME_MESSAGE)
+
+    # Display chat messages, keeping per-rerun work bounded for long sessions
+    messages = st.session_state.messages
+    older_count = len(messages) - RENDER_WINDOW
+    if older_count > 0:
+        # Expanders can't be nested (messages use them), so a toggle gates the older history
+        if st.toggle(f"Show {older_count} earlier messages", key="show_older"):
+            for message in messages[:older_count]:
+                render_message(message)
+        messages = messages[older_count:]
+
+    for message in messages:
+        render_message(message)
+
+    # Chat input
+    if prompt := st.chat_input("Ask about Nirwan's experience, skills, projects..."):
+        question = prompt
+    if question:
+        answer_question(question)
+
+    # Session info lives in the fragment (not the sidebar) so the count stays current
+    st.caption(f"📊 Messages this session: {len(st.session_state.messages)}")
+
+@st.fragment(run_every=HEALTH_TTL)
+def status_header():
+    """
+    Header with status indicator and the backend status banner
+
+    A fragment rerun every HEALTH_TTL seconds, so the status stays current while
+    chatting only reruns the chat panel.
+    """
+    health_status, health_data, health_checking = get_health_monitor().status()
+    if health_status is None:
+        status_class, status_text = "status-checking", "Checking…"
+    else:
+        status_class = "status-healthy" if health_status else "status-error"
+        status_text = "Online" if health_status else "Offline"
+        if health_checking:
+            status_text += " (re-checking…)"
+
+    st.markdown(header_html(status_class, status_text), unsafe_allow_html=True)
+
+    # Show backend status info
+    if health_status and health_data:
+        st.markdown(ready_banner_html(health_data.get('collection_count', 0)), unsafe_allow_html=True)
+    elif health_status is None:
+        st.info("⏳ Checking the backend connection…")
+    else:
+        # Keep the chat usable: a failed request is reported on the message itself
+        st.warning("⚠️ Backend API is not responding. Please ensure the FastAPI server is running on port 8000.")
+
+def ask_sample_question(question):
+    """Button callback: have the chat panel answer a sample question on this rerun"""
+    st.session_state.pending_question = question
+
+def clear_chat():
+    """Button callback: empty the history before the page is drawn"""
+    st.session_state.messages = []
 
-                # Process and display answer with think content
-                clean_content, think_blocks = process_think_content(answer)
-                st.markdown(clean_content)
+# Initialize session state
+if "messages" not in st.session_state:
+    st.session_state.messages = []
 
-                # Show thinking process if it exists
-                if think_blocks:
-                    with st.expander("🤔 Reasoning Process", expanded=False):
-                        for i, think_content in enumerate(think_blocks):
-                            if len(think_blocks) > 1:
-                                st.write(f"**Step {i+1}:**")
-                            st.text(think_content.strip())
-                            if i < len(think_blocks) - 1:
-                                st.write("---")
-
-                # Store message with think content stripped
-                clean_answer = strip_think_content(answer)
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": clean_answer,
-                    "sources": sources
-                })
-
-                # Show sources
-                if sources:
-                    with st.expander("📚 Sources", expanded=False):
-                        st.write("Information retrieved from:")
-                        for i, source in enumerate(set(sources), 1):
-                            st.write(f"• {source}")
-            else:
-                error_msg = f"❌ **Error:** {response_data}"
-                st.error(error_msg)
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": error_msg
-                })
+status_header()
+chat_panel()
 
 # Sidebar with additional info and controls
+health_status, health_data, _ = get_health_monitor().status()
 with st.sidebar:
     st.markdown("### 🎛️ Chat Controls")
 
-    if st.button("🗑️ Clear Chat History"):
-        st.session_state.messages = []
-        st.rerun()
-
-    st.markdown("### 📊 Session Info")
-    st.write(f"**Messages:** {len(st.session_state.messages)}")
+    # Callbacks run before the script, so neither button needs a second rerun
+    st.button("🗑️ Clear Chat History", on_click=clear_chat)
+    st.button("🔄 Refresh Status", on_click=get_health_monitor().invalidate)
 
-    if health_data:
+    if health_status and health_data:
         st.markdown("### 🔧 System Status")
         st.write(f"**Backend:** {health_data.get('status', 'Unknown')}")
         st.write(f"**Ollama:** {health_data.get('ollama', 'Unknown')}")
@@ -296,41 +551,8 @@ with st.sidebar:
         st.write(f"**Resume Sections:** {health_data.get('collection_count', 0)}")
 
     st.markdown("### 💡 Sample Questions")
-    sample_questions = [
-        "What companies has Nirwan worked for?",
-        "What are his main technical skills?",
-        "Tell me about his education background",
-        "What projects has he worked on?",
-        "What programming languages does he know?"
-    ]
-
-    for question in sample_questions:
-        if st.button(question, key=f"sample_{hash(question)}"):
-            # Add user message and trigger processing
-            st.session_state.messages.append({"role": "user", "content": question})
-
-            # Get assistant response
-            success, response_data = send_chat_message(question)
-
-            if success:
-                answer = response_data.get("answer", "Sorry, I couldn't generate a response.")
-                sources = response_data.get("sources", [])
-
-                # Store assistant message with think content stripped
-                clean_answer = strip_think_content(answer)
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": clean_answer,
-                    "sources": sources
-                })
-            else:
-                error_msg = f"❌ **Error:** {response_data}"
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": error_msg
-                })
-
-            st.rerun()
+    for i, question in enumerate(SAMPLE_QUESTIONS):
+        st.button(question, key=f"sample_{i}", on_click=ask_sample_question, args=(question,))
 
 # Footer
 st.markdown("---")